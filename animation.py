@@ -0,0 +1,90 @@
+'''
+Runs animations by elapsed time instead of by frames, so they take as long at 30 FPS as at 60 FPS.
+'''
+import time
+
+
+class Animation:
+    # A change that starts at start and lasts duration, both in pygame ticks (milliseconds).
+    __slots__ = ("start", "duration")
+
+    def __init__(self, start, duration):
+        self.start = start
+        self.duration = duration
+
+    def progress(self, now):
+        '''Returns how far the animation has come at now, from 0 before it starts to 1 once it's done.'''
+        if now <= self.start:
+            return 0
+        if now >= self.start + self.duration:
+            return 1
+        return (now - self.start) / self.duration
+
+    def is_done(self, now):
+        return now >= self.start + self.duration
+
+
+class AnimationScheduler:
+    '''
+    Keeps the animations that haven't finished yet by key and tells the main loop when frames have to be drawn.
+
+    Every frame starts with begin_frame, which fixes the time all animations of the frame are drawn at. Work that an
+    animation can put off, like baking its frames, should only be done while within_budget is True, which stays
+    True for budget_share of the time one frame has at the FPS cap.
+    '''
+    def __init__(self, fps, budget_share=0.5):
+        self.frame_budget = budget_share / fps
+        self.animations = {}
+        self.now = 0
+        self.frame_start_time = time.perf_counter()
+
+    def start(self, key, start, duration):
+        '''Starts an animation, replacing the animation that had the same key.'''
+        animation = self.animations[key] = Animation(start, duration)
+        return animation
+
+    def get(self, key):
+        '''Returns the animation with the key, or None if it has finished or was never started.'''
+        animation = self.animations.get(key)
+        if animation is None or animation.is_done(self.now):
+            return None
+        return animation
+
+    def progress(self, key, default=1):
+        '''Returns the progress of an animation at the time of the frame, or default if there's no such animation.'''
+        animation = self.get(key)
+        if animation is None:
+            return default
+        return animation.progress(self.now)
+
+    def cancel(self, key):
+        self.animations.pop(key, None)
+
+    def clear(self):
+        self.animations.clear()
+
+    def begin_frame(self, now):
+        '''Starts a frame drawn at now, in pygame ticks, and forgets the animations that finished before it.'''
+        self.now = now
+        self.frame_start_time = time.perf_counter()
+        for key in [key for key, animation in self.animations.items() if animation.is_done(now)]:
+            del self.animations[key]
+
+    def within_budget(self):
+        return self.budget_left() > 0
+
+    def budget_left(self):
+        '''Returns the seconds of the frame's budget that haven't been used yet, which is negative once it's over.'''
+        return self.frame_budget - (time.perf_counter() - self.frame_start_time)
+
+    def is_animating(self, now):
+        '''
+        Checks if the next frame has to be drawn at the FPS cap, because an animation that has started at now was
+        still running in the last frame. An animation that finished since then still needs its last frame drawn.
+        '''
+        return any(animation.start <= now for animation in self.animations.values())
+
+    def next_start(self, now):
+        '''Returns when the next animation that hasn't started yet starts, or None if there is none.'''
+        starts = [animation.start for animation in self.animations.values() if animation.start > now]
+        return min(starts, default=None)
@@ -0,0 +1,95 @@
+'''
+Loads what the game needs before its first frame and measures how long startup takes.
+'''
+import json
+import os
+import time
+
+import pygame
+
+CACHE_PATH = ".cache"
+FONT_CACHE_PATH = os.path.join(CACHE_PATH, "font_paths.json")
+
+font_paths = None
+
+
+def init_pygame():
+    '''Starts only the pygame modules the game uses, so audio and joysticks are never opened.'''
+    pygame.display.init()
+    pygame.font.init()
+    # pygame.time has no init of its own. Its first delay starts the timer, so get_ticks counts from here.
+    pygame.time.delay(1)
+
+
+def load_font_paths():
+    global font_paths
+    font_paths = {}
+    try:
+        with open(FONT_CACHE_PATH, "r") as cache_file:
+            font_paths = json.load(cache_file)
+    except (OSError, ValueError):
+        pass
+
+
+def save_font_paths():
+    os.makedirs(CACHE_PATH, exist_ok=True)
+    with open(FONT_CACHE_PATH, "w") as cache_file:
+        json.dump(font_paths, cache_file, indent=1)
+
+
+def resolve_font(name, bold=False, italic=False):
+    '''
+    Finds the file of a system font the same way pygame.font.SysFont does, and returns (path, fake bold, fake italic).
+    Results are saved between runs, since looking up system fonts can scan every font on the system.
+    '''
+    if font_paths is None:
+        load_font_paths()
+
+    key = f"{name}|{bold}|{italic}"
+    resolved = font_paths.get(key)
+    if resolved is None or (resolved[0] is not None and not os.path.exists(resolved[0])):
+        # SysFont passes the matched file and the styles it couldn't find a file for to the constructor.
+        resolved = pygame.font.SysFont(name, 0, bold, italic, constructor=lambda *font: list(font))
+        resolved = [resolved[0], resolved[2], resolved[3]]
+        font_paths[key] = resolved
+        save_font_paths()
+    return resolved
+
+
+def load_font(name, size, bold=False, italic=False):
+    '''Works like pygame.font.SysFont, but uses the saved font paths.'''
+    path, fake_bold, fake_italic = resolve_font(name, bold, italic)
+    font = pygame.font.Font(path, size)
+    font.set_bold(fake_bold)
+    font.set_italic(fake_italic)
+    return font
+
+
+def load_image(path):
+    '''Loads an image and converts it to the display format once, so blitting it needs no conversion.'''
+    return pygame.image.load(path).convert_alpha()
+
+
+class StartupTimer:
+    # Records how long each startup step took, counted from start_time (a time.perf_counter value).
+    def __init__(self, start_time=None):
+        if start_time is None:
+            start_time = time.perf_counter()
+        self.start_time = start_time
+        self.last_time = start_time
+        self.steps = []
+
+    def mark(self, step):
+        '''Ends a startup step.'''
+        now = time.perf_counter()
+        self.steps.append((step, now - self.last_time))
+        self.last_time = now
+
+    def total(self):
+        return self.last_time - self.start_time
+
+    def report(self):
+        '''Returns the time of each step and the total as lines of text.'''
+        lines = [f"{step:<16}{seconds * 1000:8.1f} ms" for step, seconds in self.steps]
+        lines.append(f"{'total':<16}{self.total() * 1000:8.1f} ms")
+        return "\n".join(lines)
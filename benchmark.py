@@ -0,0 +1,285 @@
+'''
+Times the drawing functions of main.py without a window, using SDL's dummy video driver.
+
+Every function and whole frames are timed on boards from 4x2 up to 15x12 and on games of 4 and 32 boards, filled with
+random guesses from a generated word library. Results are percentiles in microseconds. A run can be saved as a JSON
+baseline, and later runs fail if the frame time of any board got slower than the baseline by more than the threshold.
+
+Usage:
+    python benchmark.py --save-baseline
+    python benchmark.py [--baseline benchmark_baseline.json] [--threshold 0.2] [--window 3840x2160]
+'''
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# main.py loads its assets with paths relative to the repository.
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+import pygame
+
+import gameplay
+import layout
+import lexicon
+import main
+import multiboard
+from profiler import percentile
+
+BASELINE_PATH = "benchmark_baseline.json"
+# (word length, guesses) of the boards that are timed.
+BOARD_SIZES = [(4, 2), (5, 6), (5, 7), (6, 7), (7, 7), (10, 10), (15, 12)]
+# (word length, guesses, boards) of the games of several boards that are timed.
+MULTI_BOARD_SIZES = [(5, 7, 4), (5, 7, 32)]
+PERCENTILES = (50, 90, 99)
+WORDS_PER_LIST = 500
+WARMUP_ITERATIONS = 5
+
+
+def summarize(times):
+    '''Returns the percentiles and the mean of a list of times in seconds, in microseconds.'''
+    sorted_times = sorted(times)
+    summary = {f"p{percent}": round(percentile(sorted_times, percent) * 1e6, 1) for percent in PERCENTILES}
+    summary["mean"] = round(sum(times) / len(times) * 1e6, 1)
+    return summary
+
+
+def write_word_library(library_path, lengths, rng):
+    '''Writes random words of every length as both the check words and pick words of a word library.'''
+    for kind in ("check_words", "pick_words"):
+        os.makedirs(os.path.join(library_path, kind), exist_ok=True)
+    for length in lengths:
+        words = {"".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(length))
+                 for _ in range(WORDS_PER_LIST)}
+        for kind in ("check_words", "pick_words"):
+            with open(os.path.join(library_path, kind, f"{length}_letter_words.txt"), "w") as word_file:
+                word_file.write("\n".join(sorted(words)))
+
+
+def make_board(word_lexicon, length, guesses, rng):
+    '''Returns a game of the size with about half of its rows guessed and a word being written in the next row.'''
+    game = gameplay.new_game(word_lexicon, length, guesses, word_lexicon.pick_words(length).random_word(rng))
+    check_words = word_lexicon.check_words(length)
+    while game.guess_count < guesses // 2:
+        gameplay.submit_word(game, check_words.random_word(rng), word_lexicon)
+    for letter in check_words.random_word(rng)[:length - 1]:
+        game.type_letter(letter)
+    return game
+
+
+def make_multi_board(word_lexicon, length, guesses, num_of_boards, rng):
+    '''Returns a game of several boards with about half of its guesses made and a word being written.'''
+    answers = rng.sample(list(word_lexicon.pick_words(length)), num_of_boards)
+    game = multiboard.new_game(word_lexicon, length, multiboard.total_guesses(num_of_boards, guesses), answers)
+    check_words = word_lexicon.check_words(length)
+    while game.guess_count < game.max_guesses // 2:
+        multiboard.submit_word(game, check_words.random_word(rng), word_lexicon)
+    for letter in check_words.random_word(rng)[:length - 1]:
+        game.type_letter(letter)
+    return game
+
+
+def set_board(game):
+    '''Makes main.py draw the game, the same way starting a game does.'''
+    main.game = game
+    main.num_of_letters = main.num_of_tiles_in_row = game.length
+    main.guesses = main.num_of_rows = game.max_guesses
+    main.chosen_word = ", ".join(board.answer for board in main.game_boards())
+    main.end_score = 0
+
+
+def time_function(function, iterations):
+    '''Times a drawing function, with each call in a frame of its own, so every call adds the same items.'''
+    times = []
+    for i in range(WARMUP_ITERATIONS + iterations):
+        main.frame_renderer.begin_frame()
+        start_time = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start_time
+        main.frame_renderer.end_frame()
+        if i >= WARMUP_ITERATIONS:
+            times.append(elapsed)
+    return times
+
+
+def time_frames(iterations, before_frame=None):
+    '''Times main.draw_frame, calling before_frame first on every frame without timing it.'''
+    times = []
+    for i in range(WARMUP_ITERATIONS + iterations):
+        if before_frame is not None:
+            before_frame(i)
+        start_time = time.perf_counter()
+        main.draw_frame()
+        elapsed = time.perf_counter() - start_time
+        if i >= WARMUP_ITERATIONS:
+            times.append(elapsed)
+    return times
+
+
+def type_or_remove_letter(i):
+    # Changes one tile every frame, like typing does.
+    if i % 2:
+        main.game.remove_letter()
+    else:
+        main.game.type_letter("A")
+
+
+def invalidate(i):
+    main.frame_renderer.invalidate()
+
+
+def flip_last_row(i):
+    # Shows the reveal of the last guess as it would look on frame i at the FPS cap, starting over once it's done.
+    reveal_time = (main.num_of_letters - 1) * main.FLIP_STAGGER + main.FLIP_DURATION + main.KEY_FADE_DURATION
+    elapsed = i * 1000 // main.FPS % reveal_time
+    main.reveal_row(main.game.guess_count - 1, bytes(26), pygame.time.get_ticks() - elapsed)
+
+
+def benchmark_board(game, iterations):
+    '''Returns the timings of every drawing function and of whole frames on one game.'''
+    set_board(game)
+    main.menu_screen = None
+    main.animations.clear()
+    main.revealed_row = None
+    main.show_message(main.error_msg_not_a_word)
+    # Keeps the error message from fading away while it is timed.
+    main.animations.start("message", pygame.time.get_ticks() + 10 ** 9, main.MESSAGE_FADE_DURATION)
+
+    if main.game_rules() is multiboard:
+        main.board_cache.clear()
+        draw_grid = "draw_boards", lambda: main.draw_boards(main.game)
+    else:
+        draw_grid = "draw_all_tiles", lambda: main.draw_all_tiles(main.game)
+
+    results = {
+        draw_grid[0]: time_function(draw_grid[1], iterations),
+        "draw_keyboard": time_function(main.draw_keyboard, iterations),
+        "draw_error_message": time_function(lambda: main.draw_error_message(main.error_msg_not_a_word), iterations),
+        "draw_menu_screen_won": time_function(lambda: main.draw_menu_screen("won"), iterations),
+        "MenuButton.blit_self": time_function(main.main_menu_button.blit_self, iterations),
+    }
+    main.error_message = None
+    main.animations.clear()
+    # An idle frame where nothing changed, a frame where one tile changed and a frame that repaints everything.
+    results["frame_idle"] = time_frames(iterations)
+    results["frame_typing"] = time_frames(iterations, type_or_remove_letter)
+    results["frame_full"] = time_frames(iterations, invalidate)
+    # A frame while the tiles of the last guess flip and the keyboard fades to its new colors.
+    if main.game_rules() is not multiboard:
+        results["frame_flip"] = time_frames(iterations, flip_last_row)
+        main.animations.clear()
+        main.revealed_row = None
+    return {name: summarize(times) for name, times in results.items()}
+
+
+def benchmark_main_menu(iterations):
+    # Opens the word lists first, so the game the main menu preloads in the background is ready right away
+    # instead of competing with the timings.
+    main.word_lexicon.candidate_index(main.num_of_letters)
+    main.main_menu()
+    results = {
+        "draw_menu_screen_main": time_function(lambda: main.draw_menu_screen("main"), iterations),
+        "MenuButton.blit_self": time_function(main.start_button.blit_self, iterations),
+        "frame_idle": time_frames(iterations),
+        "frame_full": time_frames(iterations, invalidate),
+    }
+    return {name: summarize(times) for name, times in results.items()}
+
+
+def run_benchmarks(iterations, seed=0):
+    rng = random.Random(seed)
+    main.buttons_init()
+    results = {"main_menu": benchmark_main_menu(iterations)}
+    with tempfile.TemporaryDirectory() as library_path:
+        write_word_library(library_path, sorted({length for length, guesses in BOARD_SIZES}), rng)
+        word_lexicon = lexicon.Lexicon(library_path)
+        for length, guesses in BOARD_SIZES:
+            results[f"{length}x{guesses}"] = benchmark_board(make_board(word_lexicon, length, guesses, rng), iterations)
+        for length, guesses, num_of_boards in MULTI_BOARD_SIZES:
+            game = make_multi_board(word_lexicon, length, guesses, num_of_boards, rng)
+            results[f"{length}x{guesses}x{num_of_boards}"] = benchmark_board(game, iterations)
+    return {
+        "iterations": iterations,
+        "window": [main.screen_layout.width, main.screen_layout.height],
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "boards": results,
+    }
+
+
+def find_regressions(results, baseline, threshold, metric):
+    '''Returns a line for every frame timing that got slower than its baseline by more than the threshold.'''
+    regressions = []
+    for board, timings in results["boards"].items():
+        for name, summary in timings.items():
+            if not name.startswith("frame"):
+                continue
+            baseline_summary = baseline["boards"].get(board, {}).get(name)
+            if baseline_summary is None:
+                continue
+            limit = baseline_summary[metric] * (1 + threshold)
+            if summary[metric] > limit:
+                regressions.append(f"{board} {name}: {metric} {summary[metric]:.1f} us, "
+                                   f"baseline {baseline_summary[metric]:.1f} us (limit {limit:.1f} us)")
+    return regressions
+
+
+def print_results(results):
+    for board, timings in results["boards"].items():
+        print(board)
+        for name, summary in timings.items():
+            values = "  ".join(f"{key} {value:9.1f}" for key, value in summary.items())
+            print(f"    {name:<24}{values}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times the drawing functions of the game without a window.")
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls of every function")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline to compare against, if it exists")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="how much slower than the baseline a frame may get, as a fraction (default: 0.2)")
+    parser.add_argument("--metric", choices=[f"p{percent}" for percent in PERCENTILES] + ["mean"], default="p50",
+                        help="the frame time compared against the baseline")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--window", type=layout.parse_size, metavar="WIDTHxHEIGHT",
+                        help="the window size to time the frames at (default: 800x800)")
+    args = parser.parse_args()
+
+    if args.window:
+        main.resize(*args.window)
+    run_results = run_benchmarks(args.iterations)
+    print_results(run_results)
+
+    if args.json:
+        with open(args.json, "w") as results_file:
+            json.dump(run_results, results_file, indent=1)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(run_results, baseline_file, indent=1)
+        print(f"Saved baseline to {args.baseline}")
+
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as baseline_file:
+            baseline_results = json.load(baseline_file)
+        # Frame times depend on the window size, so they are only compared with a baseline of the same size.
+        baseline_window = baseline_results.get("window", [layout.DESIGN_WIDTH, layout.DESIGN_HEIGHT])
+        if baseline_window != run_results["window"]:
+            run_width, run_height = run_results["window"]
+            baseline_width, baseline_height = baseline_window
+            print(f"The baseline was timed at {baseline_width}x{baseline_height} instead of {run_width}x{run_height}, "
+                  "so it isn't compared")
+            sys.exit(0)
+        found_regressions = find_regressions(run_results, baseline_results, args.threshold, args.metric)
+        if found_regressions:
+            print(f"Frame time regressed past {args.threshold:.0%} of the baseline:")
+            print("\n".join(found_regressions))
+            sys.exit(1)
+        print(f"No frame time regressed past {args.threshold:.0%} of the baseline")
@@ -0,0 +1,201 @@
+'''
+Scores logs of guesses with the game's rules, for analytics over more games than fit in memory.
+
+Every input line holds an answer followed by one or more guesses, separated by spaces, tabs or commas. The guesses
+are played in order on a new game of the answer's length, the same way main.py plays them: a guess that is too short,
+isn't a check word or was already guessed is rejected without using up a guess, and the game ends once it's won or
+out of guesses. The game can't type a guess longer than the answer, so such a guess is rejected as wrong_length.
+Each output line holds the answer, every guess with its color codes from rules.py (0 gray, 1 yellow, 2 green) or the
+reason it was rejected, and the status and score the game ended on:
+
+    CRANE SLATE CRANE  ->  CRANE  SLATE=00202  CRANE=22222  won  1450
+
+An answer of letters other than A-Z or of a length without word lists can't be played, so every guess on its line is
+rejected as invalid_answer and the line ends on invalid_answer instead of a status and score.
+
+Input is read as a stream from the files, or from stdin, and is sent to a pool of worker processes in batches of
+lines. Only a few batches are in flight at once and the results are written as soon as their batch is done, in the
+order of the input, so memory use doesn't grow with the input. The pairs per second that are reported count every
+guess of the input, including the rejected ones and the ones after the game ended.
+
+Usage:
+    python bulk_eval.py [FILE ...] [--output results.tsv] [--guesses 6] [--hard] [--batch-size 10000]
+'''
+import argparse
+import collections
+import functools
+import multiprocessing
+import re
+import sys
+import time
+
+import gameplay
+import lexicon
+from game_state import GameState
+
+# A guess that was played after the game had already ended.
+GAME_OVER = "game_over"
+# A guess longer than the answer, which gameplay.submit_word would call too short.
+WRONG_LENGTH = "wrong_length"
+# An answer of letters other than A-Z or of a word length without word lists.
+INVALID_ANSWER = "invalid_answer"
+
+SEPARATORS = re.compile(r"[\s,]+")
+# Check word lookups are cached, since logs repeat the same guesses over and over.
+WORD_CACHE_SIZE = 2 ** 16
+
+# The lexicon and settings of a worker process, set up once by init_worker.
+worker_lexicon = None
+worker_lengths = ()
+worker_settings = None
+
+
+class CachedLexicon:
+    # Stands in for a lexicon.Lexicon in gameplay, with the check word lookups of is_word cached.
+    def __init__(self, word_lexicon):
+        self.candidate_index = word_lexicon.candidate_index
+        self.is_word = functools.lru_cache(maxsize=WORD_CACHE_SIZE)(word_lexicon.is_word)
+
+
+def init_worker(library_path, guesses, hard_mode):
+    global worker_lexicon, worker_lengths, worker_settings
+    word_lexicon = lexicon.Lexicon(library_path)
+    worker_lexicon = CachedLexicon(word_lexicon)
+    worker_lengths = frozenset(word_lexicon.available_lengths())
+    worker_settings = guesses, hard_mode
+
+
+def new_state(word_lexicon, answer, guesses, hard_mode):
+    '''
+    Returns a new game of the answer. Only hard mode needs the answers that are still possible,
+    so other games skip narrowing them down.
+    '''
+    if hard_mode:
+        return gameplay.new_game(word_lexicon, len(answer), guesses, answer, hard_mode)
+    return GameState(len(answer), guesses, answer)
+
+
+def evaluate_line(line, word_lexicon, lengths, guesses, hard_mode):
+    '''Plays the guesses of one input line and returns its output line and the amount of guesses on it.'''
+    words = SEPARATORS.split(line.strip().upper())
+    answer, played = words[0], words[1:]
+    if not (answer.isascii() and answer.isalpha() and len(answer) in lengths):
+        # No game can be played, so every guess is rejected and the line ends on invalid_answer instead of a status.
+        fields = [answer] + [f"{word}={INVALID_ANSWER}" for word in played] + [INVALID_ANSWER]
+        return "\t".join(fields), len(played)
+
+    state = new_state(word_lexicon, answer, guesses, hard_mode)
+    fields = [answer]
+    for word in played:
+        if gameplay.game_status(state) != gameplay.PLAYING:
+            fields.append(f"{word}={GAME_OVER}")
+            continue
+        if len(word) > state.length:
+            fields.append(f"{word}={WRONG_LENGTH}")
+            continue
+
+        result, color_codes = gameplay.submit_word(state, word, word_lexicon)
+        if result == gameplay.ACCEPTED:
+            fields.append(f"{word}={''.join(map(str, color_codes))}")
+        else:
+            fields.append(f"{word}={result}")
+
+    fields.append(gameplay.game_status(state))
+    fields.append(str(gameplay.score(state)))
+    return "\t".join(fields), len(played)
+
+
+def evaluate_batch(lines):
+    '''Scores a batch of input lines and returns the output text, the amount of lines and the amount of pairs.'''
+    guesses, hard_mode = worker_settings
+    output = []
+    pairs = 0
+    for line in lines:
+        output_line, line_pairs = evaluate_line(line, worker_lexicon, worker_lengths, guesses, hard_mode)
+        output.append(output_line)
+        pairs += line_pairs
+    output.append("")
+    return "\n".join(output), len(lines), pairs
+
+
+def read_batches(input_files, batch_size):
+    '''Yields the non-empty lines of the input files in lists of up to batch_size lines.'''
+    batch = []
+    for input_file in input_files:
+        for line in input_file:
+            if line.strip():
+                batch.append(line)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def evaluate_stream(input_files, output_file, guesses=gameplay.MAX_GUESSES, hard_mode=False, batch_size=10_000,
+                    processes=None, library_path=lexicon.WORD_LIBRARY_PATH):
+    '''
+    Scores every line of the input files and writes the output lines in input order.
+    Returns the amount of lines and the amount of (answer, guess) pairs that were scored.
+
+    Batches are given to the workers with apply_async instead of Pool.imap, since imap would read the whole input
+    into its task queue. At most two batches per worker are in flight, so only those are held in memory.
+    '''
+    processes = processes or multiprocessing.cpu_count()
+    total_lines = 0
+    total_pairs = 0
+    in_flight = collections.deque()
+    with multiprocessing.Pool(processes, initializer=init_worker,
+                              initargs=(library_path, guesses, hard_mode)) as pool:
+        for batch in read_batches(input_files, batch_size):
+            if len(in_flight) >= 2 * processes:
+                output, lines, pairs = in_flight.popleft().get()
+                output_file.write(output)
+                total_lines += lines
+                total_pairs += pairs
+            in_flight.append(pool.apply_async(evaluate_batch, (batch,)))
+
+        while in_flight:
+            output, lines, pairs = in_flight.popleft().get()
+            output_file.write(output)
+            total_lines += lines
+            total_pairs += pairs
+    return total_lines, total_pairs
+
+
+def open_inputs(paths):
+    '''Yields the opened input files one at a time, where - is stdin.'''
+    for path in paths:
+        if path == "-":
+            yield sys.stdin
+        else:
+            with open(path, "r") as input_file:
+                yield input_file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scores (answer, guesses) lines with the game's rules.")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="input files, where - is stdin (default: stdin)")
+    parser.add_argument("--output", help="file the results are written to (default: stdout)")
+    parser.add_argument("--guesses", type=int, default=gameplay.MAX_GUESSES,
+                        help=f"guesses every game has, which the score depends on (default: {gameplay.MAX_GUESSES})")
+    parser.add_argument("--hard", action="store_true", help="reject guesses that don't use every clue, like hard mode")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="lines sent to a worker at once")
+    parser.add_argument("--processes", type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    if args.guesses < 1 or args.batch_size < 1:
+        print("error: --guesses and --batch-size have to be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    start_time = time.perf_counter()
+    if args.output:
+        with open(args.output, "w") as results_file:
+            line_count, pair_count = evaluate_stream(open_inputs(args.inputs), results_file, args.guesses, args.hard,
+                                                     args.batch_size, args.processes)
+    else:
+        line_count, pair_count = evaluate_stream(open_inputs(args.inputs), sys.stdout, args.guesses, args.hard,
+                                                 args.batch_size, args.processes)
+    elapsed = time.perf_counter() - start_time
+    print(f"Scored {pair_count} pairs on {line_count} lines in {elapsed:.1f}s ({pair_count / elapsed:.0f} pairs/s)",
+          file=sys.stderr)
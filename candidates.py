@@ -0,0 +1,95 @@
+'''
+Keeps track of which answers are still possible as guesses are made, without checking every word again.
+
+A CandidateIndex holds a bitset for every letter at every position of the pick words, and one for every letter
+anywhere in them, as Python ints where bit i stands for the pick word with index i. Since a letter is green on
+its own spot, yellow anywhere else in the answer and gray if it isn't in the answer at all, the feedback of a
+guess narrows the possible answers down with one AND per letter.
+'''
+import rules
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def letter_bitsets(column):
+    '''
+    Returns a bitset for every letter of the alphabet, of the indexes where the letter is in column,
+    which holds one ASCII letter per word.
+    '''
+    bitsets = []
+    for letter in ALPHABET.encode("ascii"):
+        # Turns the column into a string of binary digits, with the first word as the lowest bit.
+        digits = column.translate(bytes(ord("1") if byte == letter else ord("0") for byte in range(256)))
+        bitsets.append(int(digits[::-1], 2) if digits else 0)
+    return bitsets
+
+
+class CandidateIndex:
+    # The letter bitsets of the pick words of one word length, shared by every game of that length.
+    def __init__(self, pick_words):
+        self.length = pick_words.length
+        self.words = pick_words
+        self.all_words = (1 << len(pick_words)) - 1
+
+        records = bytes(pick_words.words)
+        # at_position[position][letter] has the words with the letter at the position.
+        self.at_position = [letter_bitsets(records[position::self.length]) for position in range(self.length)]
+        # anywhere[letter] has the words with the letter at any position.
+        self.anywhere = [0] * len(ALPHABET)
+        for bitsets in self.at_position:
+            for letter, bitset in enumerate(bitsets):
+                self.anywhere[letter] |= bitset
+
+
+class CandidateSet:
+    '''
+    The answers that are still possible in one game, together with the clues found so far,
+    which hard mode requires every guess to use.
+    '''
+    __slots__ = ("index", "bits", "green_letters", "present_letters")
+
+    def __init__(self, index):
+        self.index = index
+        self.bits = index.all_words
+        # The letter found on each position, or 0 where none was found.
+        self.green_letters = bytearray(index.length)
+        # A bitset over the alphabet of the letters that are known to be in the answer.
+        self.present_letters = 0
+
+    def apply(self, word, color_codes):
+        '''Removes the answers that wouldn't have given the color codes from rules.score_word to the guess.'''
+        bits = self.bits
+        for position, (letter, code) in enumerate(zip(word, color_codes)):
+            letter_index = ord(letter) - ord("A")
+            if code == rules.GREEN:
+                bits &= self.index.at_position[position][letter_index]
+                self.green_letters[position] = ord(letter)
+                self.present_letters |= 1 << letter_index
+            elif code == rules.YELLOW:
+                bits &= self.index.anywhere[letter_index] & ~self.index.at_position[position][letter_index]
+                self.present_letters |= 1 << letter_index
+            else:
+                bits &= ~self.index.anywhere[letter_index]
+        self.bits = bits
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __iter__(self):
+        '''Yields the possible answers in the order of the pick words.'''
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            yield self.index.words[lowest.bit_length() - 1]
+            bits ^= lowest
+
+    def follows_clues(self, word):
+        '''Checks if a guess keeps every green letter on its spot and uses every letter known to be in the answer.'''
+        for position, letter in enumerate(self.green_letters):
+            if letter and ord(word[position]) != letter:
+                return False
+
+        used_letters = 0
+        for letter in word:
+            used_letters |= 1 << (ord(letter) - ord("A"))
+        return self.present_letters & ~used_letters == 0
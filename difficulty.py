@@ -0,0 +1,259 @@
+'''
+Rates how hard every pick word is as an answer, so games can be started with an answer from a difficulty band.
+
+Each answer is rated by the guesses the hint solver (solver.py) takes to find it and by how many answers still fit
+after the solver's opening guess. The solver always plays the same opening guess, so the answers are split by the
+pattern they give it, and each group is solved on its own by a pool of worker processes.
+
+The ratings of a word length are saved in word_libraries/cache as a difficulty index: a header with the checksum of
+the word packs it was built from, the pick word indexes sorted from easiest to hardest, and the rating of each pick
+word. An index is only rebuilt when one of the word lists of its length changes. Games read the index with mmap and
+pick an answer from a band in constant time, without numpy.
+
+Usage:
+    python difficulty.py [--lengths 5 6] [--processes 4] [--force]
+'''
+import argparse
+import collections
+import mmap
+import multiprocessing
+import os
+import random
+import struct
+import sys
+import time
+
+import wordpack
+from wordpack import WORD_LIBRARY_PATH
+
+# The difficulty bands answers can be picked from, each holding an equal share of the answers sorted by difficulty.
+BANDS = ("easy", "medium", "hard")
+
+MAGIC = b"WDX1"
+# Magic, format version, word length, answer count and the checksum of the word packs the index was built from.
+HEADER = struct.Struct("<4sHHI32s")
+VERSION = 1
+# Answers still fitting after the opening guess are saved as an unsigned short, so bigger counts are capped.
+MAX_ANSWERS_LEFT = 2 ** 16 - 1
+
+
+def index_path(length, library_path=WORD_LIBRARY_PATH):
+    return os.path.join(library_path, "cache", f"{length}_letter_difficulty.wdx")
+
+
+class DifficultyIndex:
+    '''
+    A difficulty index opened with mmap. The order of the answers and their ratings are read straight from the
+    mapped file, so opening an index doesn't depend on the amount of answers.
+    '''
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as index_file:
+            self.data = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.length, self.count, self.checksum = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} difficulty index")
+        view = memoryview(self.data)
+        start = HEADER.size
+        self.order = view[start:start + 4 * self.count].cast("I")
+        start += 4 * self.count
+        self.answers_left = view[start:start + 2 * self.count].cast("H")
+        start += 2 * self.count
+        self.solver_guesses = view[start:start + self.count]
+
+    def __len__(self):
+        return self.count
+
+    def band_range(self, band):
+        '''Returns the start and stop of a band in the answers sorted from easiest to hardest.'''
+        i = BANDS.index(band)
+        return i * self.count // len(BANDS), (i + 1) * self.count // len(BANDS)
+
+    def band(self, band):
+        '''Returns the pick word indexes of a band.'''
+        start, stop = self.band_range(band)
+        return self.order[start:stop]
+
+    def random_answer_index(self, band, rng=random):
+        '''Returns the pick word index of a random answer of a band.'''
+        start, stop = self.band_range(band)
+        return self.order[start + rng.randrange(stop - start)]
+
+    def rating(self, answer_index):
+        '''Returns the guesses the solver takes and the answers left after its opening guess for a pick word index.'''
+        return self.solver_guesses[answer_index], self.answers_left[answer_index]
+
+
+def load_index(length, check_words, pick_words, library_path=WORD_LIBRARY_PATH):
+    '''Opens the difficulty index of a word length, or returns None if it is missing or the word lists changed.'''
+    path = index_path(length, library_path)
+    try:
+        index = DifficultyIndex(path)
+    except (FileNotFoundError, ValueError, struct.error):
+        return None
+    if index.length != length or index.count != len(pick_words) or \
+            index.checksum != wordpack.word_lists_checksum(check_words, pick_words):
+        return None
+    return index
+
+
+def write_index(path, length, checksum, solver_guesses, answers_left):
+    '''Sorts the answers by their rating and writes the index, replacing the old one in a single step.'''
+    count = len(solver_guesses)
+    # Fewer guesses is easier, and fewer answers left after the opening guess breaks the ties.
+    order = sorted(range(count), key=lambda i: (solver_guesses[i], answers_left[i], i))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as index_file:
+        index_file.write(HEADER.pack(MAGIC, VERSION, length, count, checksum))
+        index_file.write(struct.pack(f"<{count}I", *order))
+        index_file.write(struct.pack(f"<{count}H", *(min(left, MAX_ANSWERS_LEFT) for left in answers_left)))
+        index_file.write(bytes(solver_guesses))
+    os.replace(temporary_path, path)
+
+
+# The pattern tables of a worker process by word length, loaded the first time a length is solved.
+worker_tables = {}
+
+
+def solve_group(task):
+    '''
+    Plays the solver from a history until every answer that fits it is found, and returns the word length with the
+    (pick word index, guesses taken) of each of those answers.
+    '''
+    # numpy is only needed to build an index, so reading one works without it.
+    import numpy as np
+    from pattern_matrix import load_pattern_table
+    from solver import candidate_mask, rank_guesses
+
+    length, history = task
+    table = worker_tables.get(length)
+    if table is None:
+        table = worker_tables[length] = load_pattern_table(length)
+
+    solved_pattern = 3 ** length - 1
+    results = []
+    histories = [history]
+    while histories:
+        history = histories.pop()
+        candidates = np.flatnonzero(candidate_mask(table, history))
+        if len(candidates) == 1:
+            results.append((int(candidates[0]), len(history) + 1))
+            continue
+
+        guess = rank_guesses(table, history, limit=1)[0][0]
+        guess_index = table.guesses.index(guess)
+        patterns = table.patterns(slice(guess_index, guess_index + 1), candidates)[0]
+        for pattern in np.unique(patterns).tolist():
+            if pattern == solved_pattern:
+                results.append((table.answers.index(guess), len(history) + 1))
+            else:
+                histories.append(history + [(guess, pattern)])
+    return length, results
+
+
+def opening_groups(length):
+    '''
+    Returns the solver's opening guess for a word length and the pick word indexes that give each pattern to it,
+    without the answer that is the opening guess itself.
+    '''
+    import numpy as np
+    from pattern_matrix import load_pattern_table
+    from solver import rank_guesses
+
+    table = load_pattern_table(length)
+    opening = rank_guesses(table, [], limit=1)[0][0]
+    patterns = table.guess_patterns(opening)
+    groups = {pattern: np.flatnonzero(patterns == pattern) for pattern in np.unique(patterns).tolist()}
+    groups.pop(3 ** length - 1, None)
+    return opening, groups
+
+
+def build_indexes(lengths, processes=None, force=False):
+    '''
+    Rates the answers of every word length whose index is missing or stale and saves the new indexes.
+    Returns the opening guess of every rebuilt length.
+    '''
+    stale_lengths = []
+    for length in lengths:
+        check_words, pick_words = wordpack.load_length(length)
+        if force or load_index(length, check_words, pick_words) is None:
+            stale_lengths.append(length)
+    if not stale_lengths:
+        return {}
+
+    openings = {}
+    ratings = {}
+    sized_tasks = []
+    for length in stale_lengths:
+        check_words, pick_words = wordpack.load_length(length)
+        opening, groups = opening_groups(length)
+        openings[length] = opening
+        solver_guesses = bytearray(len(pick_words))
+        answers_left = [0] * len(pick_words)
+        opening_index = pick_words.index(opening)
+        if opening_index >= 0:
+            solver_guesses[opening_index] = 1
+            answers_left[opening_index] = 1
+        for pattern, group in groups.items():
+            for answer_index in group.tolist():
+                answers_left[answer_index] = len(group)
+            sized_tasks.append((len(group), (length, [(opening, pattern)])))
+        ratings[length] = solver_guesses, answers_left
+
+    # The biggest groups take the longest, so they are started first.
+    sized_tasks.sort(key=lambda sized_task: -sized_task[0])
+    tasks = [task for size, task in sized_tasks]
+    with multiprocessing.Pool(processes) as pool:
+        for length, results in pool.imap_unordered(solve_group, tasks):
+            solver_guesses = ratings[length][0]
+            for answer_index, guesses in results:
+                solver_guesses[answer_index] = min(guesses, 255)
+
+    for length in stale_lengths:
+        check_words, pick_words = wordpack.load_length(length)
+        write_index(index_path(length), length, wordpack.word_lists_checksum(check_words, pick_words), *ratings[length])
+    return openings
+
+
+def describe_band(index, band):
+    '''Returns the range of solver guesses and answers left after the opening guess of a band.'''
+    ratings = [index.rating(answer_index) for answer_index in index.band(band)]
+    guesses = [solver_guesses for solver_guesses, answers_left in ratings]
+    answers_left = [answers_left for solver_guesses, answers_left in ratings]
+    return (f"{band} {len(ratings)} answers, {min(guesses)}-{max(guesses)} guesses, "
+            f"{min(answers_left)}-{max(answers_left)} left after the opening")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rates every answer and saves the difficulty index of each length.")
+    parser.add_argument("--lengths", type=int, nargs="+", help="word lengths to index (default: all)")
+    parser.add_argument("--processes", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="rebuild every index, even if it isn't stale")
+    args = parser.parse_args()
+
+    available_lengths = wordpack.available_lengths()
+    word_lengths = args.lengths or available_lengths
+    for word_length in word_lengths:
+        if word_length not in available_lengths:
+            print(f"error: there are no word lists of length {word_length}", file=sys.stderr)
+            sys.exit(1)
+
+    start_time = time.perf_counter()
+    opening_guesses = build_indexes(word_lengths, args.processes, args.force)
+    elapsed = time.perf_counter() - start_time
+
+    for word_length in word_lengths:
+        check_pack, pick_pack = wordpack.load_length(word_length)
+        difficulty_index = load_index(word_length, check_pack, pick_pack)
+        distribution = collections.Counter(difficulty_index.solver_guesses)
+        status = "up to date"
+        if word_length in opening_guesses:
+            status = f"built with opening {opening_guesses[word_length]}"
+        print(f"{word_length} letters: {status}, solver guesses "
+              + " ".join(f"{guesses}:{distribution[guesses]}" for guesses in sorted(distribution)))
+        for band_name in BANDS:
+            print(f"    {describe_band(difficulty_index, band_name)}")
+    print(f"Built {len(opening_guesses)} of {len(word_lengths)} indexes in {elapsed:.1f}s")
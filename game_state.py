@@ -0,0 +1,128 @@
+'''
+Compact state of one game, so many games can be kept in memory at once.
+
+Tiles and keyboard letters hold a color code, which is EMPTY while nothing is known,
+or else the color code from rules.py plus one.
+'''
+import rules
+
+EMPTY = 0
+GRAY = rules.GRAY + 1
+YELLOW = rules.YELLOW + 1
+GREEN = rules.GREEN + 1
+
+# Maps color codes to the color names used for the tiles.
+COLOR_NAMES = ("", "gray", "yellow", "green")
+
+
+class GameState:
+    '''
+    Holds the letters and colors of every tile in flat bytearrays of max_guesses rows by length columns,
+    and the best color found so far for each letter of the keyboard in a bytearray of 26 letters.
+    The row after the submitted guesses holds the word that is being written.
+    If candidates is a candidates.CandidateSet, it is narrowed down with every submitted guess.
+    '''
+    __slots__ = ("length", "max_guesses", "answer", "letters", "colors", "keyboard", "guess_count",
+                 "written_length", "green_count", "yellow_count", "hard_mode", "candidates")
+
+    def __init__(self, length, max_guesses, answer="", candidates=None, hard_mode=False):
+        self.length = length
+        self.max_guesses = max_guesses
+        self.answer = answer
+        self.letters = bytearray(length * max_guesses)
+        self.colors = bytearray(length * max_guesses)
+        self.keyboard = bytearray(26)
+        self.guess_count = 0
+        self.written_length = 0
+        self.green_count = 0
+        self.yellow_count = 0
+        self.hard_mode = hard_mode
+        self.candidates = candidates
+
+    def type_letter(self, letter):
+        '''Adds an uppercase ASCII letter to the written word. Returns False if the row is already full.'''
+        if self.written_length >= self.length or self.guess_count >= self.max_guesses:
+            return False
+        self.letters[self.guess_count * self.length + self.written_length] = ord(letter)
+        self.written_length += 1
+        return True
+
+    def remove_letter(self):
+        '''Removes the last letter of the written word.'''
+        if self.written_length > 0:
+            self.written_length -= 1
+            self.letters[self.guess_count * self.length + self.written_length] = 0
+
+    def clear_written_word(self):
+        while self.written_length > 0:
+            self.remove_letter()
+
+    def written_word(self):
+        start = self.guess_count * self.length
+        return self.letters[start:start + self.written_length].decode("ascii")
+
+    def row_word(self, row):
+        '''Returns the letters in a row, which can be shorter than the word length if the row isn't full.'''
+        start = row * self.length
+        return self.letters[start:start + self.length].rstrip(b"\0").decode("ascii")
+
+    def letter_at(self, row, column):
+        code = self.letters[row * self.length + column]
+        if code:
+            return chr(code)
+        return ""
+
+    def tile_color(self, row, column):
+        return self.colors[row * self.length + column]
+
+    def key_color(self, letter):
+        return self.keyboard[ord(letter) - ord("A")]
+
+    def is_guessed(self, word):
+        '''Checks if the word has already been submitted.'''
+        encoded_word = word.encode("ascii")
+        for row in range(self.guess_count):
+            start = row * self.length
+            if self.letters[start:start + self.length] == encoded_word:
+                return True
+        return False
+
+    def submit(self, word, color_codes):
+        '''Saves a guess with its color codes from rules.score_word in the next row and updates the keyboard.'''
+        start = self.guess_count * self.length
+        self.letters[start:start + self.length] = word.encode("ascii")
+        for column in range(self.length):
+            code = color_codes[column] + 1
+            self.colors[start + column] = code
+            if code == GREEN:
+                self.green_count += 1
+            elif code == YELLOW:
+                self.yellow_count += 1
+
+            # A letter keeps its best color, where green beats yellow and yellow beats gray.
+            key = ord(word[column]) - ord("A")
+            if code > self.keyboard[key]:
+                self.keyboard[key] = code
+
+        self.guess_count += 1
+        self.written_length = 0
+        if self.candidates is not None:
+            self.candidates.apply(word, color_codes)
+
+    def is_won(self):
+        if self.guess_count == 0:
+            return False
+        start = (self.guess_count - 1) * self.length
+        return self.colors[start:start + self.length].count(GREEN) == self.length
+
+    def is_lost(self):
+        return self.guess_count >= self.max_guesses and not self.is_won()
+
+    def history(self):
+        '''Returns the submitted guesses as (word, pattern) pairs, with the pattern packed as in rules.py.'''
+        history = []
+        for row in range(self.guess_count):
+            start = row * self.length
+            color_codes = [code - 1 for code in self.colors[start:start + self.length]]
+            history.append((self.row_word(row), rules.encode_pattern(color_codes)))
+        return history
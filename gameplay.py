@@ -0,0 +1,74 @@
+'''
+The game logic without any pygame dependency, shared by the pygame client, the server and the tools.
+'''
+import rules
+from candidates import CandidateSet
+from game_state import GameState
+
+# Results of submitting a word.
+ACCEPTED = "accepted"
+TOO_SHORT = "too_short"
+NOT_A_WORD = "not_a_word"
+ALREADY_GUESSED = "already_guessed"
+IGNORES_CLUES = "ignores_clues"
+
+# Statuses of a game.
+PLAYING = "playing"
+WON = "won"
+LOST = "lost"
+
+# The guess amounts offered in the main menu.
+MIN_GUESSES = 2
+MAX_GUESSES = 7
+
+
+def new_game(word_lexicon, length, guesses, answer=None, hard_mode=False, band=None):
+    '''
+    Returns the state of a new game, which keeps track of the answers that are still possible.
+    A random answer is picked if none is given, from the difficulty band if one is given.
+    '''
+    if answer is None:
+        answer = word_lexicon.random_answer(length, band=band)
+    return GameState(length, guesses, answer, CandidateSet(word_lexicon.candidate_index(length)), hard_mode)
+
+
+def submit_word(state, word, word_lexicon):
+    '''
+    Checks a guess and saves it with its colors if it is accepted.
+    Returns the result and the color codes of the guess, which are None if it wasn't accepted.
+    '''
+    if len(word) != state.length:
+        return TOO_SHORT, None
+
+    if not word_lexicon.is_word(word):
+        return NOT_A_WORD, None
+
+    if state.is_guessed(word):
+        return ALREADY_GUESSED, None
+
+    # Hard mode only accepts guesses that use every clue found so far.
+    if state.hard_mode and not state.candidates.follows_clues(word):
+        return IGNORES_CLUES, None
+
+    color_codes = rules.score_word(word, state.answer)
+    state.submit(word, color_codes)
+    return ACCEPTED, color_codes
+
+
+def game_status(state):
+    if state.is_won():
+        return WON
+    if state.guess_count >= state.max_guesses:
+        return LOST
+    return PLAYING
+
+
+def possible_answers(state):
+    '''Returns the amount of answers that fit every guess so far.'''
+    return len(state.candidates)
+
+
+def score(state):
+    '''Returns the score of a game, as shown on the won and lost screens.'''
+    return rules.calculate_score(state.green_count, state.yellow_count, state.length, state.max_guesses,
+                                 state.guess_count)
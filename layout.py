@@ -0,0 +1,45 @@
+'''
+Computes where things go on a window of any size.
+
+Positions are written for a DESIGN_WIDTH x DESIGN_HEIGHT window. The design is scaled to fit the window and
+centered in it, so a position in the design maps to the same spot of the game on any window.
+'''
+DESIGN_WIDTH = 800
+DESIGN_HEIGHT = 800
+
+
+def parse_size(text):
+    '''Parses a window size written as WIDTHxHEIGHT, like 3840x2160.'''
+    width, height = (int(value) for value in text.lower().split("x"))
+    if width <= 0 or height <= 0:
+        raise ValueError(f"{text} is not a window size")
+    return width, height
+
+
+class Layout:
+    '''
+    Maps design coordinates to pixels of a window of width x height pixels.
+    Everything returned is a whole amount of pixels, so rects and cached surfaces line up from frame to frame.
+    '''
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.scale = min(width / DESIGN_WIDTH, height / DESIGN_HEIGHT)
+        self.left = (width - DESIGN_WIDTH * self.scale) / 2
+        self.top = (height - DESIGN_HEIGHT * self.scale) / 2
+
+    def x(self, design_x):
+        return round(self.left + design_x * self.scale)
+
+    def y(self, design_y):
+        return round(self.top + design_y * self.scale)
+
+    def size(self, design_size):
+        '''Returns a length of the design in pixels, which is never less than one pixel.'''
+        return max(1, round(design_size * self.scale))
+
+    def center_x(self, width):
+        return (self.width - width) / 2
+
+    def center_y(self, height):
+        return (self.height - height) / 2
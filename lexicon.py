@@ -0,0 +1,105 @@
+'''
+Loads the word lists once and keeps them in memory.
+
+Each word length has a list of check words, which are all the words that can be guessed,
+and a list of pick words, which are the words that can be chosen as the answer.
+The lists are read from the compiled word packs in wordpack.py, which are rebuilt when their source changes.
+'''
+import random
+import threading
+
+import candidates
+import difficulty
+import wordpack
+from wordpack import WORD_LIBRARY_PATH
+
+
+class Lexicon:
+    '''
+    Holds the word lists of every word length. Each length is opened the first time it is used
+    and is then kept, so the same lists are shared by every game. Loading is safe from several threads.
+    '''
+    def __init__(self, library_path=WORD_LIBRARY_PATH):
+        self.library_path = library_path
+        self.lists = {}
+        self.candidate_indexes = {}
+        self.difficulty_indexes = {}
+        self.lock = threading.Lock()
+
+    def load(self, length):
+        '''Returns the (check words, pick words) of a word length, opening them the first time.'''
+        word_lists = self.lists.get(length)
+        if word_lists is None:
+            with self.lock:
+                word_lists = self.lists.get(length)
+                if word_lists is None:
+                    word_lists = wordpack.load_length(length, self.library_path)
+                    self.lists[length] = word_lists
+        return word_lists
+
+    def candidate_index(self, length):
+        '''Returns the candidates.CandidateIndex of the pick words of a word length, building it the first time.'''
+        index = self.candidate_indexes.get(length)
+        if index is None:
+            pick_words = self.pick_words(length)
+            with self.lock:
+                index = self.candidate_indexes.get(length)
+                if index is None:
+                    index = candidates.CandidateIndex(pick_words)
+                    self.candidate_indexes[length] = index
+        return index
+
+    def difficulty_index(self, length):
+        '''
+        Returns the difficulty.DifficultyIndex of a word length, or None if it hasn't been built for the current
+        word lists. The index is looked for once per word length.
+        '''
+        if length not in self.difficulty_indexes:
+            check_words, pick_words = self.load(length)
+            with self.lock:
+                if length not in self.difficulty_indexes:
+                    self.difficulty_indexes[length] = difficulty.load_index(length, check_words, pick_words,
+                                                                            self.library_path)
+        return self.difficulty_indexes[length]
+
+    def random_answers(self, length, count, rng=random, band=None, exclude=()):
+        '''
+        Picks count different random answers of a word length that aren't in exclude, from the difficulty band if
+        one is given and it holds enough answers. Raises ValueError if the word length doesn't have enough answers.
+        '''
+        pick_words = self.pick_words(length)
+        pool = range(len(pick_words))
+        index = self.difficulty_index(length) if band is not None else None
+        if index is not None and len(index.band(band)) >= count + len(exclude):
+            pool = index.band(band)
+        # Draws without replacement, so only the answers in exclude can be drawn in vain.
+        answers = [pick_words[i] for i in rng.sample(pool, min(len(pool), count + len(exclude)))]
+        answers = [answer for answer in answers if answer not in exclude][:count]
+        if len(answers) < count:
+            raise ValueError(f"there aren't {count} different answers of length {length}")
+        return answers
+
+    def available_lengths(self):
+        '''Returns the word lengths that can be played.'''
+        return wordpack.available_lengths(self.library_path)
+
+    def check_words(self, length):
+        return self.load(length)[0]
+
+    def pick_words(self, length):
+        return self.load(length)[1]
+
+    def is_word(self, word):
+        '''Checks if the word can be guessed.'''
+        return word in self.check_words(len(word))
+
+    def random_answer(self, length, rng=random, band=None):
+        '''
+        Picks a random answer of a word length without reading the word list again.
+        With a band from difficulty.BANDS the answer is picked from that band, if the length has a difficulty index.
+        '''
+        if band is not None:
+            index = self.difficulty_index(length)
+            if index is not None:
+                return self.pick_words(length)[index.random_answer_index(band, rng)]
+        return self.pick_words(length).random_word(rng)
@@ -1,8 +1,51 @@
+import time
+
+# Taken before the other imports, so the startup report includes the time spent importing.
+STARTUP_TIME = time.perf_counter()
+
+import argparse
+import logging
+import math
+
 import pygame
 import pygame.gfxdraw
-import random
 
-pygame.init()
+import animation
+import assets
+import difficulty
+import game_state
+import gameplay
+import layout
+import lexicon
+import multiboard
+import preloader
+import profiler
+import recording
+import render_cache
+import renderer
+import scheduler
+import solver
+import stats
+
+parser = argparse.ArgumentParser(description="Wordle clone")
+parser.add_argument("--startup-report", action="store_true", help="print how long each startup step took")
+parser.add_argument("--log-level", default="warning", choices=["debug", "info", "warning", "error"],
+                    help="the least important log messages that are shown (default: warning)")
+parser.add_argument("--profile", action="store_true", help="show the profiling overlay from the start (toggle with F3)")
+parser.add_argument("--trace", metavar="PATH", help="write the time of every frame section to a Chrome trace file")
+parser.add_argument("--record", metavar="PATH", help="record the input and answers of the session for replay.py")
+parser.add_argument("--size", type=layout.parse_size, metavar="WIDTHxHEIGHT",
+                    help="the size of the window when the game starts (default: 800x800)")
+parser.add_argument("--difficulty", choices=difficulty.BANDS,
+                    help="pick answers from a difficulty band, once difficulty.py has built its index")
+# Parsed when the game is run, so the drawing functions can be imported by benchmark.py without starting the game.
+args = None
+logger = logging.getLogger("wordle")
+
+startup_timer = assets.StartupTimer(STARTUP_TIME)
+startup_timer.mark("imports")
+assets.init_pygame()
+startup_timer.mark("pygame init")
 
 # Colors
 BACKGROUND_COLOR = 250, 250, 250
@@ -24,66 +67,145 @@ pygame.display.set_caption("Wordle clone")
 icon = pygame.image.load("sprites/icon.png")
 pygame.display.set_icon(icon)
 
-# Create screen
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 800
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+# Create screen. The window can be resized, and everything is laid out again for its new size.
+SCREEN_WIDTH = layout.DESIGN_WIDTH
+SCREEN_HEIGHT = layout.DESIGN_HEIGHT
+FPS = 60
+screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+screen_layout = layout.Layout(SCREEN_WIDTH, SCREEN_HEIGHT)
+frame_scheduler = scheduler.FrameScheduler(FPS)
+# Only the parts of the screen that changed since the last frame are redrawn.
+frame_renderer = renderer.RetainedRenderer(screen, BACKGROUND_COLOR)
+# Times the parts of every frame for the profiling overlay, which is toggled with F3.
+frame_profiler = profiler.FrameProfiler(FPS, ("events", "grid", "keyboard", "menu", "other", "display"))
+show_profiler = False
+startup_timer.mark("display")
 
 # Create tiles and their text
-default_tile_img = pygame.image.load("sprites/default_tile.png")
-green_tile_img = pygame.image.load("sprites/green_tile.png")
-yellow_tile_img = pygame.image.load("sprites/yellow_tile.png")
-gray_tile_img = pygame.image.load("sprites/gray_tile.png")
-tile_font = pygame.font.SysFont('Consolas', 64)
-
-tile_color_index = []
-submitted_word_list = [""]
-written_word = ""
+default_tile_img = assets.load_image("sprites/default_tile.png")
+green_tile_img = assets.load_image("sprites/green_tile.png")
+yellow_tile_img = assets.load_image("sprites/yellow_tile.png")
+gray_tile_img = assets.load_image("sprites/gray_tile.png")
+tile_font = assets.load_font('Consolas', 64)
+tile_images = {"": default_tile_img, "green": green_tile_img, "yellow": yellow_tile_img, "gray": gray_tile_img}
+tile_cache = render_cache.TileCache(tile_images, lambda size: assets.load_font('Consolas', size), BLACK)
+tile_cache.fonts[default_tile_img.get_width()] = tile_font
+# The frames of flipping tiles are baked once per letter, color and tile size.
+flip_cache = render_cache.FlipCache(tile_cache)
+
+# Tile flips, keyboard recoloring and message fades are timed in milliseconds, so they look the same at any frame rate.
+animations = animation.AnimationScheduler(FPS)
+FLIP_DURATION = 350
+# The tiles of a submitted row start to flip this many milliseconds after the tile before them.
+FLIP_STAGGER = 120
+KEY_FADE_DURATION = 250
+# The keyboard colors fade in this many steps, so each step is a cached glyph.
+KEY_FADE_STEPS = 8
+# The row that is being revealed, and the keyboard colors from before it was submitted.
+revealed_row = None
+keyboard_before_reveal = bytes(26)
+
+# Rendered text is cached, since most of it stays the same from frame to frame.
+glyph_cache = render_cache.GlyphCache()
+
+# Holds the letters and colors of the board and the keyboard.
+game = game_state.GameState(5, 7)
+# The grid starts at GRID_TOP and is kept this far from the sides of the screen and above GRID_BOTTOM, where the
+# keyboard starts. It can use the whole width of a window that is wider than the design.
+GRID_MARGIN = 40
+GRID_TOP = 70
+GRID_BOTTOM = 560
+# The boards of a game of several boards are baked into one surface each, since only a guess changes them.
+board_cache = render_cache.SurfaceCache(4 * multiboard.MAX_BOARDS)
+BOARD_GAP = 12
 
 # Game init
 guesses = num_of_rows = 7
 num_of_letters = num_of_tiles_in_row = 5
+board_count = 1
 chosen_word = ""
-all_word_list = []
+# The word lists are loaded once per word length and shared between games.
+word_lexicon = lexicon.Lexicon()
+# The next game is prepared in the background while a menu is open.
+game_preloader = preloader.GamePreloader(word_lexicon)
+# Records the session for replay.py when the game is run with --record.
+session_recorder = None
+# The result of every finished game is saved for the statistics screen.
+stats_log = stats.StatsLog()
+stats_summary = None
+STATS_BAR_WIDTH = 250
 
 # Error message
-error_font = pygame.font.SysFont('Arial', 24)
+error_font = assets.load_font('Arial', 24)
 error_message = None
 error_msg_too_short = "The word is too short!"
 error_msg_max_length = "Max word length reached!"
 error_msg_not_a_word = "The word wasn't recognized!"
 error_msg_same_word = "The word has already been guessed on!"
+error_msg_ignores_clues = "Hard mode: the word has to use every clue!"
+# How many answers the lost screen of a game of several boards lists.
+UNSOLVED_ANSWERS_SHOWN = 3
 
 MESSAGE_TIME_LIMIT = 2000
-timestamp = 0
-alpha = 255
+MESSAGE_FADE_DELAY = 5000
+MESSAGE_FADE_DURATION = 850
+
+# Profiling overlay
+profiler_font = assets.load_font('Consolas', 14)
+PROFILER_BOX_COLOR = 0, 0, 0, 180
 
 # Menu's
-menu_background = pygame.image.load("sprites/menu.png")
-menu_title_font = pygame.font.SysFont('dejavusans', 42, True)
-menu_text_font = pygame.font.SysFont('dejavusans', 20)
-button_font = pygame.font.SysFont('Consolas', 42)
+menu_sprite = assets.load_image("sprites/menu.png")
+menu_background = menu_sprite
+main_menu_background = menu_background
+# The main menu is this much taller than the other menus for the row that sets the amount of boards.
+BOARDS_ROW_HEIGHT = 100
+menu_title_font = assets.load_font('dejavusans', 42, True)
+menu_text_font = assets.load_font('dejavusans', 20)
+button_font = assets.load_font('Consolas', 42)
 menu_title = menu_title_font.render("Wordle Clone", True, MENU_TITLE_COLOR)
 length_text = menu_text_font.render("Letters in word:", True, MENU_TEXT_COLOR)
 guesses_text = menu_text_font.render("Amount of guesses:", True, MENU_TEXT_COLOR)
+boards_text = menu_text_font.render("Amount of boards:", True, MENU_TEXT_COLOR)
 game_over_text = menu_text_font.render("Game over", True, MENU_TEXT_COLOR)
 score_text = menu_text_font.render("Score:", True, MENU_TEXT_COLOR)
 is_application_running = False
 menu_screen = None
 word_length_buttons = []
 amt_of_guesses_buttons = []
+fewer_boards_button = ""
+more_boards_button = ""
 start_button = ""
 main_menu_button = ""
+hard_mode_button = ""
+hard_mode = False
+stats_button = ""
 end_score = 0
 
 # Keyboard
-keyboard_font = pygame.font.SysFont('Consolas Bold', 64)
+keyboard_font = assets.load_font('Consolas Bold', 64)
+startup_timer.mark("assets")
 keyboard_list = [["Q", "W", "E", "R", "T", "Y", "U", "I", "O", "P"], ["A", "S", "D", "F", "G", "H", "J", "K", "L"],
                  ["Z", "X", "C", "V", "B", "N", "M"]]
 alphabet_row_lengths = [0, 0, 0, 0]  # There's 1 extra zero to compensate for the next row start.
-keyboard_letter_color_list = [[], [], []]  # [[green letters], [yellow letters], [gray letters]]
+# Keyboard letter colors by the color codes in game_state.
+keyboard_letter_colors = BLACK, TILE_GRAY, TILE_YELLOW, TILE_GREEN
+# Colors of the board cells of keys in games of several boards, by the color codes in game_state and then solved.
+key_cell_colors = BUTTON_BORDER_COLOR, TILE_GRAY, TILE_YELLOW, TILE_GREEN, BACKGROUND_COLOR
+KEY_SOLVED = len(key_cell_colors) - 1
+key_cache = render_cache.SurfaceCache(256)
+KEY_CELL_PADDING = 7
 has_rendered_all_rows_once = False
 
+# Hints
+HINT_EVENT = pygame.USEREVENT + 1
+hint_service = solver.HintService(lambda generation, ranking: pygame.event.post(
+    pygame.event.Event(HINT_EVENT, generation=generation, ranking=ranking)))
+
+
+BUTTON_PADDING_X = 14
+BUTTON_PADDING_Y = 7
+
 
 class MenuButton:
     # Creates a button which can draw itself at its coordinates.
@@ -91,17 +213,29 @@ class MenuButton:
         self.x = x
         self.y = y
         self.text = text
-        self.rendered_text = button_font.render(self.text, True, BUTTON_TEXT_DEFAULT_COLOR)
+        self.rendered_text = glyph_cache.render(button_font, self.text, BUTTON_TEXT_DEFAULT_COLOR)
         self.width = self.rendered_text.get_width()
         self.height = self.rendered_text.get_height()
-        self.background = None
-        self.border = None
         self.is_selected = False
 
-    def blit_self(self):
-        padding_x = 14
-        padding_y = 7
+    @property
+    def border(self):
+        padding_x, padding_y = screen_layout.size(BUTTON_PADDING_X), screen_layout.size(BUTTON_PADDING_Y)
+        return pygame.Rect(self.x - padding_x - 1,
+                           self.y - padding_y - 1,
+                           self.width + 2 * padding_x + 2,
+                           self.height + 1.5 * padding_y + 2)
+
+    @property
+    def background(self):
+        # The area that can be clicked, which is known before the button has been drawn.
+        padding_x, padding_y = screen_layout.size(BUTTON_PADDING_X), screen_layout.size(BUTTON_PADDING_Y)
+        return pygame.Rect(self.x - padding_x,
+                           self.y - padding_y,
+                           self.width + 2 * padding_x,
+                           self.height + 1.5 * padding_y)
 
+    def blit_self(self):
         if self.is_selected:
             button_color = BUTTON_SELECTED_COLOR
             text_color = BUTTON_TEXT_SELECTED_COLOR
@@ -109,17 +243,17 @@ class MenuButton:
             button_color = BUTTON_DEFAULT_COLOR
             text_color = BUTTON_TEXT_DEFAULT_COLOR
 
-        self.border = pygame.draw.rect(screen, BUTTON_BORDER_COLOR, (self.x - padding_x - 1,
-                                                                     self.y - padding_y - 1,
-                                                                     self.width + 2 * padding_x + 2,
-                                                                     self.height + 1.5 * padding_y + 2), 0, 2)
-        self.background = pygame.draw.rect(screen, button_color, (self.x - padding_x,
-                                                                  self.y - padding_y,
-                                                                  self.width + 2 * padding_x,
-                                                                  self.height + 1.5 * padding_y), 0, 2)
+        self.rendered_text = glyph_cache.render(button_font, self.text, text_color)
+
+        border, background, rendered_text = self.border, self.background, self.rendered_text
+        text_coords = self.x, self.y
 
-        self.rendered_text = button_font.render(self.text, True, text_color)
-        screen.blit(self.rendered_text, (self.x, self.y))
+        def draw():
+            pygame.draw.rect(screen, BUTTON_BORDER_COLOR, border, 0, 2)
+            pygame.draw.rect(screen, button_color, background, 0, 2)
+            screen.blit(rendered_text, text_coords)
+
+        frame_renderer.add(("button", id(self)), border, (button_color, rendered_text, text_coords), draw)
 
 
 def center(axis, item):
@@ -129,118 +263,193 @@ def center(axis, item):
     Should only be used with rendered text and images
     '''
     if axis == "x":
-        return SCREEN_WIDTH / 2 - item.get_width() / 2
+        return screen_layout.center_x(item.get_width())
     if axis == "y":
-        return SCREEN_HEIGHT / 2 - item.get_height() / 2
+        return screen_layout.center_y(item.get_height())
 
 
 def draw_menu_screen(type_of_menu):
     '''Draws different menus depending on the current menu screen is.'''
     global end_score
     # Draws the default menu background and title.
-    to_side_of_menu = center("x", menu_background) + 25
-    title_text_coords = center("x", menu_title), 240
+    to_side_of_menu = center("x", menu_background) + screen_layout.size(25)
+    title_text_coords = center("x", menu_title), screen_layout.y(240)
 
-    menu_background_coords = center("x", menu_background), center("y", menu_background) + 15
-    screen.blit(menu_background, menu_background_coords)
+    # The main menu has its own background, which is taller if the word length buttons need more than one row.
+    if type_of_menu == "main":
+        background = main_menu_background
+    else:
+        background = menu_background
+    menu_background_coords = center("x", menu_background), center("y", menu_background) + screen_layout.size(15)
+    frame_renderer.blit("menu_background", background, menu_background_coords)
 
-    screen.blit(menu_title, title_text_coords)
+    frame_renderer.blit("menu_title", menu_title, title_text_coords)
 
     # Draws all main menu buttons and texts.
     if type_of_menu == "main":
         for button in word_length_buttons:
             button.blit_self()
-        length_text_coords = to_side_of_menu, word_length_buttons[0].y - 40
-        screen.blit(length_text, length_text_coords)
+        length_text_coords = to_side_of_menu, word_length_buttons[0].y - screen_layout.size(40)
+        frame_renderer.blit("length_text", length_text, length_text_coords)
 
         for button in amt_of_guesses_buttons:
             button.blit_self()
 
-        guesses_text_coords = to_side_of_menu, amt_of_guesses_buttons[0].y - 40
-        screen.blit(guesses_text, guesses_text_coords)
+        guesses_text_coords = to_side_of_menu, amt_of_guesses_buttons[0].y - screen_layout.size(40)
+        frame_renderer.blit("guesses_text", guesses_text, guesses_text_coords)
+
+        fewer_boards_button.blit_self()
+        more_boards_button.blit_self()
+        boards_text_coords = to_side_of_menu, fewer_boards_button.y - screen_layout.size(40)
+        frame_renderer.blit("boards_text", boards_text, boards_text_coords)
+        board_count_text = glyph_cache.render(button_font, f"{board_count}", MENU_TITLE_COLOR)
+        board_count_coords = more_boards_button.x + more_boards_button.width + screen_layout.size(30), \
+            fewer_boards_button.y
+        frame_renderer.blit("board_count", board_count_text, board_count_coords)
+
+        hard_mode_button.blit_self()
         start_button.blit_self()
+        stats_button.blit_self()
+
+    elif type_of_menu == "stats":
+        draw_stats()
+        main_menu_button.blit_self()
 
     # Draws all won or lost buttons and relevant text.
     elif type_of_menu in ["won", "lost"]:
-        game_over_text_coords = center("x", game_over_text), 300
-        screen.blit(game_over_text, game_over_text_coords)
-
-        if type_of_menu == "lost":
-            result_text = menu_text_font.render("You failed to guess the right word!", True, MENU_TEXT_COLOR)
-            right_word_text = menu_text_font.render(f"The right word was: {chosen_word}", True, MENU_TEXT_COLOR)
-
-            right_word_text_coords = center("x", right_word_text), 380
-            screen.blit(right_word_text, right_word_text_coords)
-            score_text_y = 440
+        game_over_text_coords = center("x", game_over_text), screen_layout.y(300)
+        frame_renderer.blit("game_over_text", game_over_text, game_over_text_coords)
+
+        if type_of_menu == "lost" and game_rules() is multiboard:
+            result = f"You solved {game.solved_count()} of {len(game.boards)} boards!"
+            result_text = glyph_cache.render(menu_text_font, result, MENU_TEXT_COLOR)
+            # Only the first few unsolved answers fit in the menu.
+            unsolved_answers = [board.answer for board in game.unsolved_boards()]
+            right_words = ", ".join(unsolved_answers[:UNSOLVED_ANSWERS_SHOWN])
+            if len(unsolved_answers) > UNSOLVED_ANSWERS_SHOWN:
+                right_words += f" +{len(unsolved_answers) - UNSOLVED_ANSWERS_SHOWN}"
+            right_word_text = glyph_cache.render(menu_text_font, f"Unsolved: {right_words}", MENU_TEXT_COLOR)
+
+            right_word_text_coords = center("x", right_word_text), screen_layout.y(380)
+            frame_renderer.blit("right_word_text", right_word_text, right_word_text_coords)
+            score_text_y = screen_layout.y(440)
+
+        elif type_of_menu == "lost":
+            result_text = glyph_cache.render(menu_text_font, "You failed to guess the right word!", MENU_TEXT_COLOR)
+            right_word_text = glyph_cache.render(menu_text_font, f"The right word was: {chosen_word}", MENU_TEXT_COLOR)
+
+            right_word_text_coords = center("x", right_word_text), screen_layout.y(380)
+            frame_renderer.blit("right_word_text", right_word_text, right_word_text_coords)
+            score_text_y = screen_layout.y(440)
+
+        elif game_rules() is multiboard:
+            result_text = glyph_cache.render(menu_text_font, "You've solved every board!", MENU_TEXT_COLOR)
+            score_text_y = screen_layout.y(400)
 
         else:
-            result_text = menu_text_font.render("You've guessed the right word!", True, MENU_TEXT_COLOR)
-            score_text_y = 400
+            result_text = glyph_cache.render(menu_text_font, "You've guessed the right word!", MENU_TEXT_COLOR)
+            score_text_y = screen_layout.y(400)
 
-        result_text_coords = center("x", result_text), 340
-        screen.blit(result_text, result_text_coords)
+        result_text_coords = center("x", result_text), screen_layout.y(340)
+        frame_renderer.blit("result_text", result_text, result_text_coords)
 
         # The y value will be different depending on what menu screen is drawn due to different amount of text.
-        score_text_coords = center("x", score_text) - 100, score_text_y
-        screen.blit(score_text, score_text_coords)
+        score_text_coords = center("x", score_text) - screen_layout.size(100), score_text_y
+        frame_renderer.blit("score_text", score_text, score_text_coords)
 
         # Calculates the current game score.
         if end_score == 0:
-            green_letters = 0
-            yellow_letters = 0
-
-            for row in tile_color_index:
-                row.count("green")
-                row.count("yellow")
-                green_letters += row.count("green")
-                yellow_letters += row.count("yellow")
-
-            made_guesses = len(submitted_word_list) - 1
-            end_score = (green_letters * num_of_letters * 50) + (yellow_letters * (num_of_letters * 40)) - (
-                    made_guesses * (guesses - made_guesses) * 30)
-
-        end_score_text = menu_title_font.render(f"{end_score}", True, MENU_TITLE_COLOR)
-        end_score_text_coords = center("x", end_score_text), score_text_y - 10
-        screen.blit(end_score_text, end_score_text_coords)
+            end_score = game_rules().score(game)
+
+        end_score_text = glyph_cache.render(menu_title_font, f"{end_score}", MENU_TITLE_COLOR)
+        end_score_text_coords = center("x", end_score_text), score_text_y - screen_layout.size(10)
+        frame_renderer.blit("end_score_text", end_score_text, end_score_text_coords)
         main_menu_button.blit_self()
 
 
+def draw_stats():
+    '''Draws the totals, how many guesses won games took and the average score of each word length.'''
+    to_side_of_menu = center("x", menu_background) + screen_layout.size(25)
+    totals = (f"Played {stats_summary.games}   Won {stats_summary.win_rate():.0%}   "
+              f"Streak {stats_summary.current_streak}   Best {stats_summary.max_streak}")
+    totals_text = glyph_cache.render(menu_text_font, totals, MENU_TEXT_COLOR)
+    frame_renderer.blit("stats_totals", totals_text, (center("x", totals_text), screen_layout.y(295)))
+
+    # Draws a bar for each amount of guesses, as long as its share of the most common amount.
+    most_games = max(1, int(stats_summary.guess_counts.max()))
+    bar_y = screen_layout.y(330)
+    bar_width = screen_layout.size(STATS_BAR_WIDTH)
+    line_height = screen_layout.size(20)
+    for made_guesses in range(1, len(stats_summary.guess_counts)):
+        games = int(stats_summary.guess_counts[made_guesses])
+        guesses_label = glyph_cache.render(menu_text_font, f"{made_guesses}", MENU_TEXT_COLOR)
+        frame_renderer.blit(("stats_guesses", made_guesses), guesses_label, (to_side_of_menu, bar_y))
+
+        bar = pygame.Rect(to_side_of_menu + screen_layout.size(25), bar_y + screen_layout.size(3),
+                          max(2, bar_width * games // most_games), screen_layout.size(16))
+        frame_renderer.add(("stats_bar", made_guesses), bar, None,
+                           lambda bar=bar: pygame.draw.rect(screen, MENU_TITLE_COLOR, bar))
+        games_text = glyph_cache.render(menu_text_font, f"{games}", MENU_TEXT_COLOR)
+        frame_renderer.blit(("stats_games", made_guesses), games_text, (bar.right + screen_layout.size(8), bar_y))
+        bar_y += line_height
+
+    # The average scores wrap onto a new line if they would go past the side of the menu.
+    max_x = to_side_of_menu + menu_background.get_width() - screen_layout.size(50)
+    x = to_side_of_menu
+    y = bar_y + screen_layout.size(10)
+    averages = ["Average score:"] + [f"{length}: {mean_score:.0f}" for length, (games, wins, mean_score)
+                                      in sorted(stats_summary.lengths.items())]
+    for i, average in enumerate(averages):
+        average_text = glyph_cache.render(menu_text_font, average, MENU_TEXT_COLOR)
+        if x > to_side_of_menu and x + average_text.get_width() > max_x:
+            x = to_side_of_menu
+            y += screen_layout.size(24)
+        frame_renderer.blit(("stats_average", i), average_text, (x, y))
+        x += average_text.get_width() + screen_layout.size(16)
+
+
+def open_stats():
+    '''Opens the statistics screen with the statistics of every saved game.'''
+    global menu_screen, stats_summary
+    stats_summary = stats.summarize(stats_log.path)
+    menu_screen = "stats"
+    logger.info("Opened statistics")
+
+
 def draw_keyboard():
     '''
     Draws the keyboard once to calculate the center of the screen depending on each rows' width,
     then it uses the result as the coordinates for each row.
     '''
     global has_rendered_all_rows_once
-    text_x_start = SCREEN_WIDTH / 2 - alphabet_row_lengths[0] / 2
-    text_y_start = 600
+    text_x_start = screen_layout.center_x(alphabet_row_lengths[0])
+    text_y_start = screen_layout.y(600)
     text_x = text_x_start
     text_y = text_y_start
-    spacing_x = 20
-    spacing_y = 50
+    spacing_x = screen_layout.size(20)
+    spacing_y = screen_layout.size(50)
 
     # Renders each letter in each row.
     for row in range(len(keyboard_list)):
         row_length = 0
 
-        # Changes the color of the letter depending on what nested list in keyboard_letter_color_list it is in.
+        # Changes the color of the letter to the best color it has gotten in the game.
         for letter in range(len(keyboard_list[row])):
-            if keyboard_list[row][letter] in keyboard_letter_color_list[0]:
-                color = TILE_GREEN
-
-            elif keyboard_list[row][letter] in keyboard_letter_color_list[1]:
-                color = TILE_YELLOW
-
-            elif keyboard_list[row][letter] in keyboard_letter_color_list[2]:
-                color = TILE_GRAY
+            # In a game of several boards the letter is black and the board colors are shown in cells behind it.
+            if game_rules() is multiboard:
+                render_letter = glyph_cache.render(keyboard_font, keyboard_list[row][letter], BLACK)
+                key_coords = text_x - screen_layout.size(KEY_CELL_PADDING), text_y
+                frame_renderer.blit(("key", keyboard_list[row][letter]),
+                                    key_cells(keyboard_list[row][letter], render_letter), key_coords)
 
             else:
-                color = BLACK
+                color = key_color(keyboard_list[row][letter])
 
-            if not has_rendered_all_rows_once:
-                color = WHITE
+                if not has_rendered_all_rows_once:
+                    color = WHITE
 
-            render_letter = keyboard_font.render(keyboard_list[row][letter], True, color)
-            screen.blit(render_letter, (text_x, text_y))
+                render_letter = glyph_cache.render(keyboard_font, keyboard_list[row][letter], color)
+                frame_renderer.blit(("key", keyboard_list[row][letter]), render_letter, (text_x, text_y))
             # Prepares the x value for the next letter.
             text_x += render_letter.get_width() + spacing_x
 
@@ -249,360 +458,791 @@ def draw_keyboard():
                 row_length += render_letter.get_width() + spacing_x
 
         if not has_rendered_all_rows_once:
-            row_length -= 20
+            row_length -= spacing_x
             alphabet_row_lengths[row] = row_length
 
         text_y += spacing_y
         # Sets the next x value based on the next rows own width, this requires an extra item in the list.
-        text_x = SCREEN_WIDTH / 2 - alphabet_row_lengths[row + 1] / 2
+        text_x = screen_layout.center_x(alphabet_row_lengths[row + 1])
     has_rendered_all_rows_once = True
 
 
-def words_init():
-    '''Reads words from word library to all_word_list.'''
-    global all_word_list
-    all_word_list = []
+def key_color(letter):
+    '''
+    Returns the color of a key of the keyboard. After a guess the keys fade from their old colors once the tiles
+    of the guess have flipped.
+    '''
+    code = game.key_color(letter)
+    recolor = animations.get("keyboard")
+    old_code = keyboard_before_reveal[ord(letter) - ord("A")]
+    if recolor is None or old_code == code:
+        return keyboard_letter_colors[code]
+
+    step = round(recolor.progress(animations.now) * KEY_FADE_STEPS) / KEY_FADE_STEPS
+    old_color, new_color = keyboard_letter_colors[old_code], keyboard_letter_colors[code]
+    return tuple(round(old + (new - old) * step) for old, new in zip(old_color, new_color))
 
-    with open(f"word_libraries/check_words/{num_of_letters}_letter_words.txt", "r") as word_file:
-        for word in word_file:
-            all_word_list.append(word.rstrip().upper())
 
+def key_cells(letter, render_letter):
+    '''
+    Returns a key of the keyboard in a game of several boards: the rendered letter over a grid with a cell for every
+    board, in the best color the letter has gotten on that board. The cells of solved boards are left blank.
+    '''
+    codes = bytes(KEY_SOLVED if is_solved else board.key_color(letter)
+                  for board, is_solved in zip(game.boards, game.is_solved))
+    return key_cache.get((letter, codes), lambda: bake_key(render_letter, codes))
+
+
+def bake_key(render_letter, codes):
+    '''
+    Draws the letter over its board cells, which are laid out in the grid closest to a square and reach
+    KEY_CELL_PADDING past the sides of the letter.
+    '''
+    cell_rows = math.isqrt(len(codes))
+    while len(codes) % cell_rows:
+        cell_rows -= 1
+    cell_columns = len(codes) // cell_rows
+
+    padding = screen_layout.size(KEY_CELL_PADDING)
+    surface = pygame.Surface((render_letter.get_width() + 2 * padding, render_letter.get_height()))
+    surface.fill(BACKGROUND_COLOR)
+    # Every key has the same height, from the top of a capital letter to the baseline.
+    capital_top = keyboard_font.get_ascent() - keyboard_font.metrics("H")[0][3]
+    area = pygame.Rect(0, capital_top - padding, surface.get_width(),
+                       keyboard_font.get_ascent() - capital_top + 2 * padding)
+    for i, code in enumerate(codes):
+        column, row = i % cell_columns, i // cell_columns
+        left = area.x + area.width * column // cell_columns
+        top = area.y + area.height * row // cell_rows
+        right = area.x + area.width * (column + 1) // cell_columns
+        bottom = area.y + area.height * (row + 1) // cell_rows
+        surface.fill(key_cell_colors[code], (left, top, right - left, bottom - top))
+    surface.blit(render_letter, (padding, 0))
+    return surface
+
+
+def draw_possible_answers():
+    '''Draws the amount of answers that still fit every guess above the grid.'''
+    possible_answers_text = glyph_cache.render(menu_text_font,
+                                               f"Possible answers: {game_rules().possible_answers(game)}",
+                                               MENU_TEXT_COLOR)
+    frame_renderer.blit("possible_answers", possible_answers_text,
+                        (center("x", possible_answers_text), screen_layout.y(15)))
+
+
+def preload_next_game():
+    '''Prepares a game with the selected settings in the background, so it's ready once the player starts it.'''
+    game_preloader.request(num_of_letters, guesses)
+
+
+def show_message(message):
+    '''Shows a message above the grid, which starts to fade away after MESSAGE_FADE_DELAY ticks.'''
+    global error_message
+    error_message = message
+    animations.start("message", pygame.time.get_ticks() + MESSAGE_FADE_DELAY, MESSAGE_FADE_DURATION)
 
-def choose_word():
-    '''Chooses a random word from a file, removes the newline and uppers it.'''
-    word_list = []
-    with open(f"word_libraries/pick_words/{num_of_letters}_letter_words.txt", "r") as word_file:
-        for word in word_file:
-            word_list.append(word.rstrip().upper())
 
-    word = random.choice(word_list)
-    print(f"chosen_word: {word}")
-    return word
+def bake_message_box(message):
+    '''Draws the text of a message on its black box.'''
+    render_text = glyph_cache.render(error_font, message, WHITE)
+    box = pygame.Surface((render_text.get_width() + screen_layout.size(15) + 1,
+                          render_text.get_height() + screen_layout.size(10) + 1))
+    box.fill(BLACK)
+    box.blit(render_text, (screen_layout.size(8), screen_layout.size(5)))
+    return box
 
 
 def draw_error_message(message):
     '''
-    Takes the message string and draws it as a message on the screen.
+    Draws the shown message on the screen, faded by how far its fade animation has come.
     There can only be up to one message present at all times.
     '''
-    global timestamp, alpha, error_message
-    error_message = message
-    render_text = error_font.render(message, True, WHITE)
-    text_x = center("x", render_text)
-    text_y = 50
-    box_x = text_x - 8
-    box_y = text_y - 5
-    box_w = render_text.get_width() + 15
-    box_h = render_text.get_height() + 10
-
-    # Fades away the error message after MESSAGE_TIME_LIMIT ticks.
-    if message is not None:
-        if timestamp == 0:
-            timestamp = pygame.time.get_ticks()
-
-        if alpha > 0:
-            if pygame.time.get_ticks() > timestamp + 5000:
-                alpha -= 5
-
-            pygame.gfxdraw.filled_polygon(screen,
-                                          ((box_x, box_y), (box_x, box_y + box_h), (box_x + box_w, box_y + box_h),
-                                           (box_x + box_w, box_y)), (0, 0, 0, alpha))
-            if alpha > 10:
-                screen.blit(render_text, (text_x, text_y))
+    global error_message
+    fade = animations.get("message")
+    if message is None or fade is None:
+        error_message = None
+        return
 
-        else:
-            error_message = None
-            alpha = 255
-            timestamp = 0
+    # The box is baked once, and fading it only changes the alpha it's blitted with.
+    message_box = glyph_cache.get(("message", message), lambda: bake_message_box(message))
+    box_alpha = round(255 * (1 - fade.progress(animations.now)))
+    box_x = int(center("x", message_box))
+    box_y = screen_layout.y(50) - screen_layout.size(5)
 
+    def draw():
+        message_box.set_alpha(box_alpha)
+        screen.blit(message_box, (box_x, box_y))
 
-def draw_tile(x, y, letter, tile_color):
-    '''Draws a colored tile at x and y, then draws the text in the tile.'''
-    if tile_color == "green":
-        screen.blit(green_tile_img, (x, y))
+    frame_renderer.add("error_message", message_box.get_rect(topleft=(box_x, box_y)), (message_box, box_alpha), draw)
 
-    elif tile_color == "yellow":
-        screen.blit(yellow_tile_img, (x, y))
 
-    elif tile_color == "gray":
-        screen.blit(gray_tile_img, (x, y))
+def draw_tile(x, y, letter, tile_color, tile_size):
+    '''Draws a colored tile with its letter at x and y, using the prebaked tile from the tile cache.'''
+    frame_renderer.blit(("tile", x, y), tile_cache.tile(letter, tile_color, tile_size), (x, y))
 
+
+def draw_flipping_tile(x, y, letter, tile_color, tile_size, column):
+    '''
+    Draws a tile of the row that is being revealed. The tile stays unrevealed until its flip starts.
+    Flip frames that aren't baked yet are only baked while the frame is within its budget, otherwise the tile
+    is drawn without the flip.
+    '''
+    flip = animations.get(("flip", column))
+    if flip is None:
+        draw_tile(x, y, letter, tile_color, tile_size)
+        return
+
+    progress = flip.progress(animations.now)
+    if progress == 0:
+        draw_tile(x, y, letter, "", tile_size)
+    elif flip_cache.is_baked(letter, tile_color, tile_size) or animations.within_budget():
+        frames = flip_cache.frames(letter, tile_color, tile_size)
+        frame = frames[min(len(frames) - 1, int(progress * len(frames)))]
+        frame_renderer.blit(("tile", x, y), frame, (x, y))
     else:
-        screen.blit(default_tile_img, (x, y))
+        draw_tile(x, y, letter, "" if progress < 0.5 else tile_color, tile_size)
 
-    render_text = tile_font.render(letter, True, BLACK)
-    text_coords = x + (default_tile_img.get_width() - render_text.get_width()) / 2, y + 5
-    screen.blit(render_text, text_coords)
 
+def grid_tile_size():
+    '''Returns the size of the tiles of a game of one board, which shrink to fit between the sides and the keyboard.'''
+    gap = screen_layout.size(6)
+    return min(screen_layout.size(default_tile_img.get_width()),
+               int((screen_layout.width - 2 * screen_layout.size(GRID_MARGIN) + gap) / num_of_tiles_in_row) - gap,
+               int((screen_layout.y(GRID_BOTTOM) - screen_layout.y(GRID_TOP)) / num_of_rows) - gap)
 
-def draw_all_tiles(list_of_words):
-    '''Draws the grid of all tiles and puts the written words in the tiles.'''
-    spacing = default_tile_img.get_width() + 6
-    start_x = SCREEN_WIDTH / 2 - (num_of_tiles_in_row * spacing - 8) / 2
-    start_y = 70
+
+def draw_all_tiles(board):
+    '''
+    Draws the grid of all tiles of a game state and puts the written words in the tiles.
+    The tiles shrink if the grid would be too wide for the screen or would reach the keyboard.
+    '''
+    gap = screen_layout.size(6)
+    start_y = screen_layout.y(GRID_TOP)
+    tile_size = grid_tile_size()
+    spacing = tile_size + gap
+    start_x = screen_layout.center_x(num_of_tiles_in_row * spacing - screen_layout.size(8))
     x = start_x
     y = start_y
 
-    # For each row select a word to draw if there is one, else leave empty.
+    # Draws each tile with its letter, if there is one, and its color.
     for row in range(num_of_rows):
-        if len(list_of_words) > row:
-            word = list_of_words[row]
-
-        else:
-            word = ""
-
-        # Draw letter in tiles if there is one, else draw nothing
         for column in range(num_of_letters):
-            if len(word) > column:
-                letter = word[column]
-
+            letter = board.letter_at(row, column)
+            color = game_state.COLOR_NAMES[board.tile_color(row, column)]
+            if row == revealed_row:
+                draw_flipping_tile(x, y, letter, color, tile_size, column)
             else:
-                letter = ""
-
-            color = tile_color_index[row][column]
-            draw_tile(x, y, letter, color)
+                draw_tile(x, y, letter, color, tile_size)
             x += spacing
 
         x = start_x
         y += spacing
 
+    if revealed_row is not None:
+        bake_next_flips(board, tile_size)
+
+
+def bake_next_flips(board, tile_size):
+    '''
+    Bakes the flip frames of the revealed row's tiles in the order their flips start, one tile at a time while the
+    frame's budget has room for another tile as long as the last one took. The rest are baked by the next frames.
+    '''
+    bake_time = 0
+    for column in range(num_of_letters):
+        if animations.get(("flip", column)) is None:
+            continue
+        letter = board.letter_at(revealed_row, column)
+        color = game_state.COLOR_NAMES[board.tile_color(revealed_row, column)]
+        if flip_cache.is_baked(letter, color, tile_size):
+            continue
+        if animations.budget_left() <= bake_time:
+            return
+        bake_start_time = time.perf_counter()
+        flip_cache.frames(letter, color, tile_size)
+        bake_time = time.perf_counter() - bake_start_time
+
+
+def board_layout(num_of_boards, length, rows):
+    '''
+    Returns the amount of board columns, the tile size and the gap between tiles that give the biggest tiles when
+    the boards of a game are laid out in a grid above the keyboard.
+    '''
+    board_gap = screen_layout.size(BOARD_GAP)
+    grid_width = screen_layout.width - 2 * screen_layout.size(GRID_MARGIN)
+    grid_height = screen_layout.y(GRID_BOTTOM) - screen_layout.y(GRID_TOP)
+    best_columns, best_step = 1, 0
+    for columns in range(1, num_of_boards + 1):
+        board_rows = math.ceil(num_of_boards / columns)
+        step = min((grid_width - (columns - 1) * board_gap) / (columns * length),
+                   (grid_height - (board_rows - 1) * board_gap) / (board_rows * rows))
+        if step >= best_step:
+            best_columns, best_step = columns, step
+
+    step = max(2, min(int(best_step), screen_layout.size(default_tile_img.get_width() + 6)))
+    gap = min(screen_layout.size(6), max(1, step // 8))
+    return best_columns, step - gap, gap
+
+
+def bake_tiles(tiles, columns, tile_size, gap):
+    '''Draws a list of (letter, tile color) tiles row by row onto one surface, with a single batched blit.'''
+    step = tile_size + gap
+    rows = math.ceil(len(tiles) / columns)
+    surface = pygame.Surface((columns * step - gap, rows * step - gap))
+    surface.fill(BACKGROUND_COLOR)
+    surface.blits([(tile_cache.tile(letter, tile_color, tile_size), (i % columns * step, i // columns * step))
+                   for i, (letter, tile_color) in enumerate(tiles)], False)
+    return surface
+
+
+def bake_board(board, tile_size, gap):
+    '''Bakes the submitted rows of a board, with empty tiles in the rows that haven't been guessed on.'''
+    tiles = []
+    for row in range(board.max_guesses):
+        for column in range(board.length):
+            if row < board.guess_count:
+                tiles.append((board.letter_at(row, column), game_state.COLOR_NAMES[board.tile_color(row, column)]))
+            else:
+                tiles.append(("", ""))
+    return bake_tiles(tiles, board.length, tile_size, gap)
+
+
+def draw_boards(multi_game):
+    '''
+    Draws every board of a game of several boards. A board is baked into one surface when a guess changes it, and the
+    word being written is baked once and drawn over the next row of each unsolved board, so a frame only blits
+    two cached surfaces per board no matter how many tiles there are.
+    '''
+    num_of_boards = len(multi_game.boards)
+    columns, tile_size, gap = board_layout(num_of_boards, multi_game.length, multi_game.max_guesses)
+    step = tile_size + gap
+    board_width = multi_game.length * step - gap
+    board_height = multi_game.max_guesses * step - gap
+    board_gap = screen_layout.size(BOARD_GAP)
+    start_x = round(screen_layout.center_x(columns * (board_width + board_gap) - board_gap))
+    start_y = screen_layout.y(GRID_TOP)
+
+    written = multi_game.written_word()
+    written_row = board_cache.get(
+        ("written", written, multi_game.length, tile_size),
+        lambda: bake_tiles([(letter, "") for letter in written] + [("", "")] * (multi_game.length - len(written)),
+                           multi_game.length, tile_size, gap))
+
+    for i, board in enumerate(multi_game.boards):
+        x = start_x + i % columns * (board_width + board_gap)
+        y = start_y + i // columns * (board_height + board_gap)
+        board_surface = board_cache.get(("board", i, board.guess_count, tile_size),
+                                        lambda: bake_board(board, tile_size, gap))
+        frame_renderer.blit(("board", i), board_surface, (x, y))
+        if not multi_game.is_solved[i] and board.guess_count < board.max_guesses:
+            frame_renderer.blit(("written_row", i), written_row, (x, y + board.guess_count * step))
+
 
 def word_submit_request(word):
     '''
     Checks if the word is a real word and if it's the right word.
     Ends the game if it is the right word, or if it was the last guess.
     '''
-    global all_word_list, written_word, menu_screen
-    print(f"Submitted word: {word}")
+    global menu_screen
+    logger.debug("Submitted word: %s", word)
+    rules = game_rules()
+    keyboard_before = bytes(game.keyboard) if rules is gameplay else None
+    result, color_codes = rules.submit_word(game, word, word_lexicon)
+
+    if result == gameplay.TOO_SHORT:
+        show_message(error_msg_too_short)
+        logger.debug("%s is too short", word)
+
+    elif result == gameplay.NOT_A_WORD:
+        show_message(error_msg_not_a_word)
+        logger.debug("%s wasn't recognized", word)
+
+    elif result == gameplay.ALREADY_GUESSED:
+        show_message(error_msg_same_word)
+        logger.debug("%s is already submitted", word)
+
+    elif result == gameplay.IGNORES_CLUES:
+        show_message(error_msg_ignores_clues)
+        logger.debug("%s doesn't use every clue", word)
+
+    # The word was saved in the next row with the color of each letter depending on if it is
+    # on the right spot in the word or not, and the keyboard colors were updated.
+    else:
+        hint_service.cancel()
+        # The tiles of a game of several boards are baked per board, so its rows are shown without flipping.
+        if rules is gameplay:
+            reveal_row(game.guess_count - 1, keyboard_before)
+        logger.debug("%s was accepted with color codes %s, %d answers left", word, color_codes,
+                     rules.possible_answers(game))
+
+        status = rules.game_status(game)
+        if status == gameplay.LOST:
+            logger.info("Game Lost")
+            menu_screen = "lost"
+
+        elif status == gameplay.WON:
+            logger.info("Game Won")
+            menu_screen = "won"
+
+        if menu_screen is not None:
+            preload_next_game()
+            # The statistics are kept for games of one board.
+            if stats_log is not None and rules is gameplay:
+                stats_log.record_game(game)
+            if session_recorder is not None:
+                for board in game_boards():
+                    session_recorder.record_board(board)
+
+
+def reveal_row(row, keyboard_before, start=None):
+    '''
+    Flips the tiles of a submitted row one after another, starting at start in pygame ticks or now, and recolors the
+    keyboard once they are done. The flip frames are baked by the frames that draw the row, see bake_next_flips.
+    '''
+    global revealed_row, keyboard_before_reveal
+    revealed_row = row
+    keyboard_before_reveal = keyboard_before
+    if start is None:
+        start = pygame.time.get_ticks()
+    for column in range(num_of_letters):
+        animations.start(("flip", column), start + column * FLIP_STAGGER, FLIP_DURATION)
+    animations.start("keyboard", start + (num_of_letters - 1) * FLIP_STAGGER + FLIP_DURATION, KEY_FADE_DURATION)
 
-    # Checks if submitted word is long enough
-    if len(written_word) != num_of_tiles_in_row:
-        draw_error_message(error_msg_too_short)
-        print(f"{word} is too short")
 
-    else:
-        if word in all_word_list:
-            # Checks if word already guessed on.
-            num_of_times_in_list = submitted_word_list.count(word)
-            if num_of_times_in_list > 1:
-                draw_error_message(error_msg_same_word)
-                print(f"{word} is already submitted")
-
-            # Saves the written word
-            else:
-                submitted_word_list.append(word)
-                submitted_word_list[-1] = ""  # This line resets the editable row.
-                written_word = ""  # This line resets the editable list.
-                index_of_submitted_word = submitted_word_list.index(submitted_word_list[-2])
-                print(f"{word} was accepted")
-
-                # Updates the tile_color_index and the keyboard_letter_color_list depending on if each letter
-                # in the submitted word is on the right spot in the word or not.
-                for letter in range(num_of_letters):
-                    if word[letter] == chosen_word[letter]:
-                        tile_color_index[index_of_submitted_word][letter] = "green"
-                        # Checks if the letter is not present in the nested lists in the keyboard_letter_color_list.
-                        if not any(word[letter] in nested_list for nested_list in keyboard_letter_color_list[0]):
-                            keyboard_letter_color_list[0].append(word[letter])
-
-                    elif word[letter] in chosen_word:
-                        tile_color_index[index_of_submitted_word][letter] = "yellow"
-                        if not any(word[letter] in nested_list for nested_list in keyboard_letter_color_list[1]):
-                            keyboard_letter_color_list[1].append(word[letter])
-
-                    else:
-                        tile_color_index[index_of_submitted_word][letter] = "gray"
-                        if not any(word[letter] in nested_list for nested_list in keyboard_letter_color_list):
-                            keyboard_letter_color_list[2].append(word[letter])
-                print(f"submitted_word_list: {submitted_word_list}")
-
-                # End game if it was the last guess.
-                if len(submitted_word_list) > guesses:
-                    print("Game Lost")
-                    menu_screen = "lost"
-
-                # End game if it was the right word.
-                if submitted_word_list[-2] == chosen_word:
-                    print("Game Won")
-                    menu_screen = "won"
-                print(f"tile_color_index {tile_color_index}")
+def max_board_count():
+    '''Returns the most boards a game can have, which is limited by the answers of the selected word length.'''
+    return min(multiboard.MAX_BOARDS, len(word_lexicon.pick_words(num_of_letters)))
 
-        else:
-            draw_error_message(error_msg_not_a_word)
-            print(f"{word} wasn't recognized")
-        print(f"keyboard_letter_color_list: {keyboard_letter_color_list}")
+
+def clamp_board_count():
+    '''Lowers the amount of boards to what the selected word length has answers for.'''
+    global board_count
+    board_count = min(board_count, max_board_count())
+
+
+def game_rules():
+    '''Returns the module with the rules of the current game, which is multiboard for a game of several boards.'''
+    if isinstance(game, multiboard.MultiBoardGame):
+        return multiboard
+    return gameplay
+
+
+def game_boards():
+    '''Returns the state of every board of the current game.'''
+    if isinstance(game, multiboard.MultiBoardGame):
+        return game.boards
+    return [game]
 
 
 def start():
     '''Readies all necessary variables to start a new game.'''
-    print("Start game")
-    global chosen_word, menu_screen, end_score
+    logger.info("Start game")
+    global chosen_word, menu_screen, end_score, game, revealed_row
     menu_screen = None
-    words_init()
-    chosen_word = choose_word()
-    end_score = 0
+    animations.clear()
+    revealed_row = None
+    # Takes the game prepared in the background, or prepares it now if it isn't ready.
+    game = game_preloader.take(num_of_letters, guesses)
+    if game_preloader.band is not None and word_lexicon.difficulty_index(num_of_letters) is None:
+        logger.warning("There is no difficulty index of %d letter words, so the answer was picked from every word. "
+                       "Run difficulty.py to build it.", num_of_letters)
+    answers = [game.answer]
+    clamp_board_count()
+    if board_count > 1:
+        # The other boards take their answers from the preloader as well, so a replay gets the recorded answers.
+        answers += game_preloader.take_answers(num_of_letters, board_count - 1, exclude=answers)
+        game = multiboard.new_game(word_lexicon, num_of_letters, multiboard.total_guesses(board_count, guesses),
+                                   answers)
+        board_cache.clear()
+    else:
+        game.hard_mode = hard_mode
 
-    # Generate color indexes for all tiles
-    for row_number in range(num_of_rows):
-        tile_color_index.append([])
-        for i in range(num_of_tiles_in_row):
-            tile_color_index[row_number].append("")
+    if session_recorder is not None:
+        for answer in answers:
+            session_recorder.record_answer(answer)
+    chosen_word = ", ".join(answers)
+    end_score = 0
+    logger.debug("chosen_word: %s", chosen_word)
 
 
 def buttons_init():
-    '''Sets up all buttons.'''
-    global start_button, main_menu_button
-    # Generates word length buttons
-    to_side_of_menu = center("x", menu_background) + 40
-    spacing = 0
-    for i in range(4):
-        word_length_buttons.append(MenuButton(f"{4 + i}", to_side_of_menu + spacing, 350))
-        word_length_buttons[i].blit_self()
-        spacing += 60
+    '''Sets up all buttons for the current layout. Buttons made for an earlier layout are replaced.'''
+    global start_button, main_menu_button, hard_mode_button, stats_button, fewer_boards_button, more_boards_button, \
+        main_menu_background, num_of_letters, num_of_tiles_in_row
+    word_length_buttons.clear()
+    amt_of_guesses_buttons.clear()
+
+    # Generates a word length button for each word length that has word lists.
+    # The buttons continue on a new row if they would go past the side of the menu.
+    to_side_of_menu = center("x", menu_background) + screen_layout.size(40)
+    max_x = to_side_of_menu + menu_background.get_width() - screen_layout.size(80)
+    x = to_side_of_menu
+    y = screen_layout.y(350)
+    for length in word_lexicon.available_lengths():
+        button = MenuButton(f"{length}", x, y)
+        if x > to_side_of_menu and x + button.width > max_x:
+            x = button.x = to_side_of_menu
+            y = button.y = y + screen_layout.size(50)
+        word_length_buttons.append(button)
+        x += max(screen_layout.size(60), button.width + screen_layout.size(37))
+
+    # Everything below the word length buttons moves down by the extra rows, and the row of the amount of boards
+    # makes the menu taller.
+    extra_height = y - screen_layout.y(350)
+    menu_height = menu_background.get_height() + extra_height + screen_layout.size(BOARDS_ROW_HEIGHT)
+    main_menu_background = pygame.transform.smoothscale(menu_sprite, (menu_background.get_width(), menu_height))
 
     # Generates amount of guesses buttons
     spacing = 0
-    for i in range(6):
-        amt_of_guesses_buttons.append(MenuButton(f"{2 + i}", to_side_of_menu + spacing, 450))
-        spacing += 60
+    for i in range(gameplay.MAX_GUESSES - gameplay.MIN_GUESSES + 1):
+        amt_of_guesses_buttons.append(MenuButton(f"{gameplay.MIN_GUESSES + i}", to_side_of_menu + spacing,
+                                                 screen_layout.y(450) + extra_height))
+        spacing += screen_layout.size(60)
 
     # Selects two default options
+    if num_of_letters not in word_lexicon.available_lengths():
+        num_of_letters = num_of_tiles_in_row = int(word_length_buttons[0].text)
     default_guesses = guesses - int(amt_of_guesses_buttons[0].text)
-    default_length = num_of_letters - int(word_length_buttons[0].text)
     amt_of_guesses_buttons[default_guesses].is_selected = True
-    word_length_buttons[default_length].is_selected = True
+    for button in word_length_buttons:
+        button.is_selected = int(button.text) == num_of_letters
+
+    # Generates the buttons that change the amount of boards, which is shown next to them.
+    fewer_boards_button = MenuButton("-", to_side_of_menu, screen_layout.y(550) + extra_height)
+    more_boards_button = MenuButton("+", to_side_of_menu + screen_layout.size(60), screen_layout.y(550) + extra_height)
+
+    # Generates the hard mode button, which is selected while hard mode is on.
+    extra_height += screen_layout.size(BOARDS_ROW_HEIGHT)
+    hard_mode_button = MenuButton("Hard", to_side_of_menu, screen_layout.y(535) + extra_height)
+    hard_mode_button.is_selected = hard_mode
 
     # Generates start button
-    start_button = MenuButton("Start", 0, 535)
-    start_button.blit_self()
-    start_button.x = SCREEN_WIDTH / 2 - start_button.width / 2
+    start_button = MenuButton("Start", 0, screen_layout.y(535) + extra_height)
+    start_button.x = center("x", start_button.rendered_text)
+
+    # Generates the statistics button on the other side of the start button than the hard mode button.
+    stats_button = MenuButton("Stats", 0, screen_layout.y(535) + extra_height)
+    stats_button.x = max_x - stats_button.width
 
     # Generates main menu button
-    main_menu_button = MenuButton("Main menu", 0, 530)
-    main_menu_button.blit_self()
-    main_menu_button.x = SCREEN_WIDTH / 2 - main_menu_button.width / 2
+    main_menu_button = MenuButton("Main menu", 0, screen_layout.y(530))
+    main_menu_button.x = center("x", main_menu_button.rendered_text)
+
+
+def measure_keyboard():
+    '''Measures the width of every keyboard row with the current keyboard font, so the rows can be centered.'''
+    spacing_x = screen_layout.size(20)
+    for row in range(len(keyboard_list)):
+        alphabet_row_lengths[row] = sum(keyboard_font.size(letter)[0] + spacing_x for letter in keyboard_list[row]) \
+            - spacing_x
+
+
+def scale_assets():
+    '''
+    Loads the fonts and scales the menu sprite for the scale of the current layout. This only happens when the window
+    is resized, so frames only blit surfaces that already have the right size. Tiles are scaled by the tile cache.
+    '''
+    global error_font, profiler_font, menu_background, menu_title_font, menu_text_font, button_font, keyboard_font, \
+        menu_title, length_text, guesses_text, boards_text, game_over_text, score_text
+    error_font = assets.load_font('Arial', screen_layout.size(24))
+    profiler_font = assets.load_font('Consolas', screen_layout.size(14))
+    keyboard_font = assets.load_font('Consolas Bold', screen_layout.size(64))
+
+    menu_background = pygame.transform.smoothscale(
+        menu_sprite, (screen_layout.size(menu_sprite.get_width()), screen_layout.size(menu_sprite.get_height())))
+    menu_title_font = assets.load_font('dejavusans', screen_layout.size(42), True)
+    menu_text_font = assets.load_font('dejavusans', screen_layout.size(20))
+    button_font = assets.load_font('Consolas', screen_layout.size(42))
+    menu_title = menu_title_font.render("Wordle Clone", True, MENU_TITLE_COLOR)
+    length_text = menu_text_font.render("Letters in word:", True, MENU_TEXT_COLOR)
+    guesses_text = menu_text_font.render("Amount of guesses:", True, MENU_TEXT_COLOR)
+    boards_text = menu_text_font.render("Amount of boards:", True, MENU_TEXT_COLOR)
+    game_over_text = menu_text_font.render("Game over", True, MENU_TEXT_COLOR)
+    score_text = menu_text_font.render("Score:", True, MENU_TEXT_COLOR)
+
+
+def resize(width, height):
+    '''Lays everything out again for a window of width x height pixels.'''
+    global screen, screen_layout
+    # The window was already resized if the player dragged its border, but not if a recorded resize is replayed.
+    if pygame.display.get_surface().get_size() != (width, height):
+        pygame.display.set_mode((width, height), pygame.RESIZABLE)
+    screen = frame_renderer.surface = pygame.display.get_surface()
+    new_layout = layout.Layout(width, height)
+    is_rescaled = new_layout.scale != screen_layout.scale
+    screen_layout = new_layout
+    logger.debug("Resized to %dx%d, scale %.2f", width, height, screen_layout.scale)
+
+    if is_rescaled:
+        scale_assets()
+        glyph_cache.clear()
+        key_cache.clear()
+        flip_cache.clear()
+    board_cache.clear()
+    buttons_init()
+    measure_keyboard()
+    frame_renderer.invalidate()
 
 
 def main_menu():
     '''Resets all variables for a new round.'''
-    print("Opened main menu")
-    global tile_color_index, submitted_word_list, written_word, is_application_running, menu_screen,\
-        keyboard_letter_color_list
-    tile_color_index = []
-    submitted_word_list = [""]
-    written_word = ""
-    keyboard_letter_color_list = [[], [], []]  # [[green_letters], [yellow_letters], [gray_letters]]
+    logger.info("Opened main menu")
+    global game, is_application_running, menu_screen
+    game = game_state.GameState(num_of_letters, guesses)
     is_application_running = True
+    hint_service.cancel()
+    animations.clear()
     menu_screen = "main"
+    preload_next_game()
+
+
+def request_hint():
+    '''Asks the hint service for the best next guess based on the rows submitted so far.'''
+    hint_service.request(num_of_letters, game.history())
+    logger.debug("Hint requested")
+
+
+def show_hint(hint_event):
+    '''Shows the best guess from a finished hint, unless the board has changed since it was requested.'''
+    if menu_screen is None and hint_event.generation == hint_service.generation and hint_event.ranking:
+        word, bits = hint_event.ranking[0]
+        show_message(f"Hint: {word}")
+        logger.debug("Hint: %s (%.2f bits)", word, bits)
 
 
 def word_edit_control(input):
     '''Checks how the player wants to edit the word.'''
-    global written_word
     if input == pygame.K_RETURN:
-        word_submit_request(written_word)
+        word_submit_request(game.written_word())
+
+    elif input == pygame.K_TAB:
+        request_hint()
 
     # Remove the last letter in the written word
     elif input == pygame.K_BACKSPACE:
-        written_word = written_word[:-1]
-        submitted_word_list[-1] = written_word  # Updates the word on display
+        game.remove_letter()
 
     # Uppers and saves the written word if it's a letter an if it's the right length
-    if len(written_word) < num_of_tiles_in_row:
-        if event.unicode.isalpha():
-            written_word += event.unicode.upper()
-            submitted_word_list[-1] = written_word
+    if game.written_length < num_of_tiles_in_row:
+        if event.unicode.isascii() and event.unicode.isalpha():
+            game.type_letter(event.unicode.upper())
 
     else:
-        draw_error_message(error_msg_max_length)
-        print(f"Max word length reached")
+        show_message(error_msg_max_length)
+        logger.debug("Max word length reached")
 
 
 def menu_button_functionality():
     '''Triggers button and changes its color if activated depending on what menu is active.'''
-    global num_of_letters, num_of_tiles_in_row, guesses, num_of_rows
+    global num_of_letters, num_of_tiles_in_row, guesses, num_of_rows, hard_mode, board_count
     # Changes color of pressed down button
     if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-        active_mouse_coords = pygame.mouse.get_pos()
+        active_mouse_coords = event.pos
 
         if menu_screen == "main":
             # Checks if player selected a word length.
             for button in word_length_buttons:
                 if button.background.collidepoint(active_mouse_coords):
                     num_of_letters = num_of_tiles_in_row = int(button.text)
-                    print(f"length {button.text}")
-                button.is_selected = False
+                    clamp_board_count()
+                    logger.debug("length %s", button.text)
 
-            offset = int(word_length_buttons[0].text)
-            word_length_buttons[num_of_letters - offset].is_selected = True
+            for button in word_length_buttons:
+                button.is_selected = int(button.text) == num_of_letters
 
             # Checks if player selected the amount of guesses.
             for button in amt_of_guesses_buttons:
                 if button.background.collidepoint(active_mouse_coords):
                     guesses = num_of_rows = int(button.text)
-                    print(f"guesses {button.text}")
+                    logger.debug("guesses %s", button.text)
                 button.is_selected = False
 
             offset = int(amt_of_guesses_buttons[0].text)
             amt_of_guesses_buttons[guesses - offset].is_selected = True
 
+            # Changes the amount of boards one at a time, since a button for every amount wouldn't fit in the menu.
+            if fewer_boards_button.background.collidepoint(active_mouse_coords):
+                board_count = max(multiboard.MIN_BOARDS, board_count - 1)
+                fewer_boards_button.is_selected = True
+                logger.debug("boards %s", board_count)
+
+            if more_boards_button.background.collidepoint(active_mouse_coords):
+                board_count = min(max_board_count(), board_count + 1)
+                more_boards_button.is_selected = True
+                logger.debug("boards %s", board_count)
+
+            # Turns hard mode on or off.
+            if hard_mode_button.background.collidepoint(active_mouse_coords):
+                hard_mode = hard_mode_button.is_selected = not hard_mode
+                logger.debug("hard mode %s", hard_mode)
+
+            # A preload for the old settings is thrown away if the player changed them.
+            preload_next_game()
+
             # Changes color on start button if clicked.
             if start_button.background.collidepoint(active_mouse_coords):
                 start_button.is_selected = True
 
+            if stats_button.background.collidepoint(active_mouse_coords):
+                stats_button.is_selected = True
+
         # Changes color on menu button if clicked.
-        if menu_screen in ["won", "lost"]:
+        if menu_screen in ["won", "lost", "stats"]:
             if main_menu_button.background.collidepoint(active_mouse_coords):
                 main_menu_button.is_selected = True
 
     # Changes the color of all not-clicked buttons and starts game or goes to menu depending on what button was clicked.
     if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-        active_mouse_coords = pygame.mouse.get_pos()
+        active_mouse_coords = event.pos
         if menu_screen == "main":
             if start_button.background.collidepoint(active_mouse_coords):
                 start()
-        if menu_screen in ["won", "lost"]:
+            elif stats_button.background.collidepoint(active_mouse_coords):
+                open_stats()
+        elif menu_screen in ["won", "lost", "stats"]:
             if main_menu_button.background.collidepoint(active_mouse_coords):
                 main_menu()
 
         main_menu_button.is_selected = False
         start_button.is_selected = False
+        stats_button.is_selected = False
+        fewer_boards_button.is_selected = False
+        more_boards_button.is_selected = False
+
+
+def draw_profiler_hud():
+    '''Draws the frame times of the last frames in the top left corner, over everything else.'''
+    lines = frame_profiler.report()
+    line_height = profiler_font.get_linesize()
+    rendered_lines = [glyph_cache.render(profiler_font, line, WHITE) for line in lines]
+    margin = screen_layout.size(5)
+    box = pygame.Rect(margin, margin, max(line.get_width() for line in rendered_lines) + 2 * margin,
+                      len(lines) * line_height + 2 * margin)
+
+    def draw():
+        pygame.gfxdraw.box(screen, box, PROFILER_BOX_COLOR)
+        for i, rendered_line in enumerate(rendered_lines):
+            screen.blit(rendered_line, (box.x + margin, box.y + margin + i * line_height))
+
+    frame_renderer.add("profiler_hud", box, tuple(lines), draw)
+
+
+def draw_frame():
+    '''Draws all items on screen depending on if a menu is open or not, and returns the rects that were updated.'''
+    frame_renderer.begin_frame()
+    animations.begin_frame(pygame.time.get_ticks())
+
+    # The board isn't shown behind the main menu and the statistics screen.
+    if menu_screen not in ["main", "stats"]:
+        with frame_profiler.section("grid"):
+            if game_rules() is multiboard:
+                draw_boards(game)
+            else:
+                draw_all_tiles(game)
+        with frame_profiler.section("keyboard"):
+            draw_keyboard()
+        with frame_profiler.section("other"):
+            draw_possible_answers()
+            draw_error_message(error_message)
 
+    if menu_screen is not None:
+        with frame_profiler.section("menu"):
+            draw_menu_screen(menu_screen)
 
-# ======= Game Starts Here =======
-main_menu()
-buttons_init()
+    if show_profiler:
+        with frame_profiler.section("other"):
+            draw_profiler_hud()
 
+    # Redraws and updates only the parts of the screen that changed
+    with frame_profiler.section("display"):
+        return frame_renderer.end_frame()
 
-# Main game loop
-while is_application_running:
-    screen.fill(BACKGROUND_COLOR)
 
-    # Draws all items on screen depending on if a menu is open or not.
-    if menu_screen != "main":
-        draw_all_tiles(submitted_word_list)
-        draw_keyboard()
-        draw_error_message(error_message)
+def handle_event():
+    '''Handles the current event.'''
+    global is_application_running, show_profiler
+    if session_recorder is not None:
+        session_recorder.record_event(event)
 
-    if menu_screen is not None:
-        draw_menu_screen(menu_screen)
+    # Closes the app if clicked on exit.
+    if event.type == pygame.QUIT:
+        is_application_running = False
 
-    for event in pygame.event.get():
-        # Closes the app if clicked on exit.
-        if event.type == pygame.QUIT:
+    # The window was uncovered, so it has to be drawn again.
+    if event.type == pygame.WINDOWEXPOSED:
+        frame_renderer.invalidate()
+
+    if event.type == pygame.VIDEORESIZE:
+        resize(event.w, event.h)
+
+    if event.type == HINT_EVENT:
+        show_hint(event)
+
+    if event.type == pygame.KEYDOWN:
+        # Stops the app.
+        if event.key == pygame.K_DELETE or event.key == pygame.K_ESCAPE:
             is_application_running = False
 
-        if event.type == pygame.KEYDOWN:
-            # Stops the app.
-            if event.key == pygame.K_DELETE or event.key == pygame.K_ESCAPE:
-                is_application_running = False
+        # Shows or hides the profiling overlay.
+        if event.key == pygame.K_F3:
+            show_profiler = not show_profiler
 
-            if menu_screen is None:
-                word_edit_control(event.key)
+        if menu_screen is None:
+            word_edit_control(event.key)
 
-        menu_button_functionality()
+    menu_button_functionality()
 
-    # Updates screen
-    pygame.display.flip()
-    # Limit game loop to 60 times a second
-    pygame.time.Clock().tick(60)
+
+# ======= Game Starts Here =======
+def run_game():
+    '''Opens the main menu and runs the main game loop until the game is closed.'''
+    global event, startup_timer, show_profiler, session_recorder
+    show_profiler = args.profile
+    if args.trace:
+        frame_profiler.trace_writer = profiler.TraceWriter(args.trace)
+    game_preloader.band = args.difficulty
+    if args.size:
+        resize(*args.size)
+    else:
+        buttons_init()
+    if args.record:
+        session_recorder = recording.SessionRecorder(args.record, num_of_letters, guesses, hard_mode, board_count,
+                                                     (screen_layout.width, screen_layout.height))
+    main_menu()
+    startup_timer.mark("menu")
+    # Only the events the game handles are put on the event queue.
+    scheduler.allow_only([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                          pygame.WINDOWEXPOSED, pygame.VIDEORESIZE, HINT_EVENT])
+
+    # Main game loop
+    try:
+        while is_application_running:
+            draw_frame()
+
+            if startup_timer is not None:
+                startup_timer.mark("first frame")
+                if args.startup_report:
+                    print(startup_timer.report())
+                startup_timer = None
+
+            # Runs at the FPS cap while something is animating, otherwise sleeps until an event arrives
+            # or until the next animation starts.
+            now = pygame.time.get_ticks()
+            events = frame_scheduler.next_events(animations.is_animating(now), animations.next_start(now))
+            # Only handling the events counts towards the frame, not waiting for them.
+            with frame_profiler.section("events"):
+                for event in events:
+                    handle_event()
+            frame_profiler.end_frame()
+
+    # The trace and the recording are closed even if the game crashed, so both stay readable.
+    finally:
+        if frame_profiler.trace_writer is not None:
+            frame_profiler.trace_writer.close()
+        if session_recorder is not None:
+            session_recorder.close(game_boards())
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s: %(message)s")
+    run_game()
@@ -0,0 +1,132 @@
+'''
+Games of several boards that are solved at once, like Quordle. Every guess is played on each board that isn't solved
+yet, and the guess is scored against the answers of all of those boards in one numpy call.
+
+The functions here mirror the ones in gameplay.py, so main.py can use either module for the current game.
+'''
+import numpy as np
+
+import gameplay
+from pattern_matrix import encode_words, score_against
+
+# The amounts of boards the main menu can be set to, where one board is a normal game.
+MIN_BOARDS = 1
+MAX_BOARDS = 32
+
+
+def total_guesses(num_of_boards, guesses):
+    '''Returns the guesses a game of several boards gets, which is one more for each board after the first.'''
+    return guesses + num_of_boards - 1
+
+
+class MultiBoardGame:
+    '''
+    Holds the GameState of each board. The word being written is typed on every unsolved board,
+    and a solved board keeps the rows it had when it was solved.
+    '''
+    def __init__(self, boards):
+        self.boards = boards
+        self.length = boards[0].length
+        self.max_guesses = boards[0].max_guesses
+        self.answer_codes = encode_words([board.answer for board in boards], self.length)
+        self.is_solved = np.zeros(len(boards), dtype=bool)
+        self.guesses = []
+        self.written = ""
+        self.hard_mode = False
+
+    @property
+    def guess_count(self):
+        return len(self.guesses)
+
+    @property
+    def written_length(self):
+        return len(self.written)
+
+    def unsolved_boards(self):
+        return [self.boards[i] for i in np.flatnonzero(~self.is_solved)]
+
+    def type_letter(self, letter):
+        '''Adds an uppercase ASCII letter to the written word of every unsolved board.'''
+        if len(self.written) >= self.length or self.guess_count >= self.max_guesses:
+            return False
+        self.written += letter
+        for board in self.unsolved_boards():
+            board.type_letter(letter)
+        return True
+
+    def remove_letter(self):
+        if self.written:
+            self.written = self.written[:-1]
+            for board in self.unsolved_boards():
+                board.remove_letter()
+
+    def written_word(self):
+        return self.written
+
+    def is_guessed(self, word):
+        return word in self.guesses
+
+    def submit(self, word):
+        '''Saves a guess on every unsolved board and returns its (unsolved boards x length) color codes.'''
+        unsolved = np.flatnonzero(~self.is_solved)
+        color_codes = score_against(encode_words([word], self.length)[0], self.answer_codes[unsolved])
+        for i, board_codes in zip(unsolved, color_codes):
+            self.boards[i].submit(word, board_codes.tolist())
+            self.is_solved[i] = self.boards[i].is_won()
+
+        self.guesses.append(word)
+        self.written = ""
+        return color_codes
+
+    def solved_count(self):
+        return int(np.count_nonzero(self.is_solved))
+
+    def is_won(self):
+        return bool(self.is_solved.all())
+
+    def is_lost(self):
+        return self.guess_count >= self.max_guesses and not self.is_won()
+
+    def history(self):
+        '''Returns the history of the first unsolved board, which is the board hints are given for.'''
+        unsolved_boards = self.unsolved_boards()
+        if unsolved_boards:
+            return unsolved_boards[0].history()
+        return []
+
+
+def new_game(word_lexicon, length, guesses, answers):
+    '''Returns a game with a board for each answer.'''
+    return MultiBoardGame([gameplay.new_game(word_lexicon, length, guesses, answer) for answer in answers])
+
+
+def submit_word(game, word, word_lexicon):
+    '''Works like gameplay.submit_word, but for every unsolved board of the game.'''
+    if len(word) != game.length:
+        return gameplay.TOO_SHORT, None
+
+    if not word_lexicon.is_word(word):
+        return gameplay.NOT_A_WORD, None
+
+    if game.is_guessed(word):
+        return gameplay.ALREADY_GUESSED, None
+
+    return gameplay.ACCEPTED, game.submit(word)
+
+
+def game_status(game):
+    if game.is_won():
+        return gameplay.WON
+    if game.guess_count >= game.max_guesses:
+        return gameplay.LOST
+    return gameplay.PLAYING
+
+
+def possible_answers(game):
+    '''Returns the amount of answers that fit every guess so far, added up over the unsolved boards.'''
+    return sum(gameplay.possible_answers(board) for board in game.unsolved_boards())
+
+
+def score(game):
+    '''Returns the sum of the scores of every board.'''
+    return sum(gameplay.score(board) for board in game.boards)
@@ -0,0 +1,142 @@
+'''
+Batch scoring of word lists with NumPy.
+
+Words are encoded as arrays of letter indexes (A = 0) with one row per word, and the feedback of every guess
+against every answer is computed at once into a guess x answer matrix of packed patterns (see rules.py).
+The matrix for each word length is saved in word_libraries/cache and is only rebuilt when a word list changes.
+Word lengths with too many words for a full matrix are scored in chunks whenever their patterns are needed.
+'''
+import os
+import time
+
+import numpy as np
+
+import wordpack
+from rules import GRAY, GREEN, YELLOW
+from wordpack import WORD_LIBRARY_PATH
+
+CACHE_PATH = os.path.join(WORD_LIBRARY_PATH, "cache")
+
+# Upper limit for the amount of letter comparisons done at once, which keeps the memory use of a chunk bounded.
+CHUNK_CELLS = 4_000_000
+# Largest guess x answer matrix that is computed up front and cached.
+MAX_MATRIX_CELLS = 50_000_000
+
+
+def encode_words(words, length):
+    '''Encodes a list of words as a (words x length) array of letter indexes.'''
+    letters = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+    return letters.reshape(len(words), length) - ord("A")
+
+
+def encode_pack(pack):
+    '''Encodes a word pack the same way as encode_words, reading the letters straight from the mapped file.'''
+    letters = np.frombuffer(pack.words, dtype=np.uint8)
+    return letters.reshape(len(pack), pack.length) - ord("A")
+
+
+def pattern_dtype(length):
+    '''Returns the smallest unsigned integer type that fits every pattern of a word length.'''
+    if 3 ** length <= 2 ** 16:
+        return np.uint16
+    return np.uint32
+
+
+def compute_patterns(guess_codes, answer_codes):
+    '''Scores every encoded guess against every encoded answer and returns the guess x answer pattern matrix.'''
+    num_of_guesses, length = guess_codes.shape
+    num_of_answers = len(answer_codes)
+    dtype = pattern_dtype(length)
+    weights = 3 ** np.arange(length, dtype=np.int64)
+
+    # is_in_answer[answer, letter] is True if the letter is anywhere in the answer.
+    is_in_answer = np.zeros((num_of_answers, 26), dtype=bool)
+    is_in_answer[np.arange(num_of_answers)[:, None], answer_codes] = True
+
+    matrix = np.empty((num_of_guesses, num_of_answers), dtype=dtype)
+    rows_per_chunk = max(1, CHUNK_CELLS // max(1, num_of_answers * length))
+    for start in range(0, num_of_guesses, rows_per_chunk):
+        guess_chunk = guess_codes[start:start + rows_per_chunk]
+        green = guess_chunk[:, None, :] == answer_codes[None, :, :]
+        yellow = is_in_answer[:, guess_chunk].transpose(1, 0, 2)
+        codes = np.where(green, GREEN, np.where(yellow, YELLOW, 0))
+        matrix[start:start + rows_per_chunk] = codes @ weights
+    return matrix
+
+
+def score_against(guess_codes, answer_codes):
+    '''Scores one encoded guess against every encoded answer and returns an (answers x length) array of color codes.'''
+    green = answer_codes == guess_codes
+    # is_in_answer[answer, position] is True if the guessed letter at the position is anywhere in the answer.
+    is_in_answer = (answer_codes[:, :, None] == guess_codes[None, None, :]).any(axis=1)
+    return np.where(green, GREEN, np.where(is_in_answer, YELLOW, GRAY)).astype(np.uint8)
+
+
+class PatternTable:
+    '''
+    Holds the word packs of one word length and scores guesses against answers.
+
+    The full guess x answer matrix is only kept if it has at most MAX_MATRIX_CELLS patterns. For bigger word lists
+    the patterns are computed from the encoded words when they are asked for, so memory stays bounded.
+    '''
+    def __init__(self, length, guesses, answers, matrix=None):
+        self.length = length
+        self.guesses = guesses
+        self.answers = answers
+        self.matrix = matrix
+        self.guess_codes = encode_pack(guesses)
+        self.answer_codes = encode_pack(answers)
+
+    def patterns(self, guess_indexes, answer_indexes):
+        '''Returns the pattern matrix of the selected guesses (rows) against the selected answers (columns).'''
+        if self.matrix is not None:
+            return self.matrix[guess_indexes][:, answer_indexes]
+        return compute_patterns(self.guess_codes[guess_indexes], self.answer_codes[answer_indexes])
+
+    def guess_patterns(self, guess):
+        '''Returns the patterns of one guess against every answer.'''
+        i = self.guesses.index(guess)
+        return self.patterns(slice(i, i + 1), slice(None))[0]
+
+    def lookup(self, guess, answer):
+        '''Returns the packed pattern of a guess against an answer.'''
+        i = self.guesses.index(guess)
+        j = self.answers.index(answer)
+        return int(self.patterns(slice(i, i + 1), slice(j, j + 1))[0, 0])
+
+
+def load_pattern_table(length):
+    '''
+    Loads the pattern table of a word length with its matrix from the cache.
+    The matrix is computed and saved again if it is missing or the word lists have changed since it was saved.
+    '''
+    check_words, pick_words = wordpack.load_length(length)
+    table = PatternTable(length, check_words, pick_words)
+    if len(check_words) * len(pick_words) > MAX_MATRIX_CELLS:
+        return table
+
+    cache_file = os.path.join(CACHE_PATH, f"{length}_letter_patterns.npz")
+    checksum = wordpack.word_lists_checksum(check_words, pick_words).hex()
+    if os.path.exists(cache_file):
+        with np.load(cache_file) as cached:
+            if str(cached["checksum"]) == checksum:
+                table.matrix = cached["matrix"]
+                return table
+
+    table.matrix = compute_patterns(table.guess_codes, table.answer_codes)
+    os.makedirs(CACHE_PATH, exist_ok=True)
+    np.savez(cache_file, checksum=checksum, matrix=table.matrix)
+    return table
+
+
+if __name__ == "__main__":
+    # Builds the cached pattern matrix of every word length that is small enough to have one.
+    for word_length in wordpack.available_lengths():
+        start_time = time.perf_counter()
+        pattern_table = load_pattern_table(word_length)
+        elapsed = time.perf_counter() - start_time
+        rows, columns = len(pattern_table.guesses), len(pattern_table.answers)
+        if pattern_table.matrix is None:
+            print(f"{word_length} letters: {rows} x {columns} patterns are too many to cache")
+        else:
+            print(f"{word_length} letters: {rows} x {columns} patterns in {elapsed:.3f}s")
@@ -0,0 +1,68 @@
+'''
+Prepares the next game on a worker thread while the player is in a menu, so starting a game doesn't wait on disk.
+'''
+import queue
+import threading
+
+import gameplay
+
+
+def prepare_game(word_lexicon, length, guesses, band=None):
+    '''
+    Opens the word lists of the word length, picks an answer, from the difficulty band if one is given,
+    and returns the state of a new game.
+    '''
+    word_lexicon.load(length)
+    return gameplay.new_game(word_lexicon, length, guesses, band=band)
+
+
+class GamePreloader:
+    '''
+    Keeps one game prepared for the settings that were last requested.
+    If other settings are requested before it is taken, the old preload is thrown away.
+    Every answer is picked from band, a difficulty band of difficulty.BANDS, or from every answer if it's None.
+    '''
+    def __init__(self, word_lexicon, band=None):
+        self.word_lexicon = word_lexicon
+        self.band = band
+        self.settings = None
+        self.prepared = None
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.worker = threading.Thread(target=self.run, name="game-preloader", daemon=True)
+        self.worker.start()
+
+    def request(self, length, guesses):
+        '''Starts preparing a game with the settings, unless one is already prepared or being prepared for them.'''
+        with self.lock:
+            if self.settings == (length, guesses):
+                return
+            self.settings = length, guesses
+            self.prepared = None
+        self.requests.put((length, guesses))
+
+    def take(self, length, guesses):
+        '''Returns the prepared game if it matches the settings, otherwise prepares one right away.'''
+        with self.lock:
+            prepared = self.prepared
+            self.settings = None
+            self.prepared = None
+
+        if prepared is None or (prepared.length, prepared.max_guesses) != (length, guesses):
+            prepared = prepare_game(self.word_lexicon, length, guesses, self.band)
+        return prepared
+
+    def take_answers(self, length, count, exclude=()):
+        '''Returns count different answers for the other boards of a game, which aren't in exclude.'''
+        return self.word_lexicon.random_answers(length, count, band=self.band, exclude=exclude)
+
+    def run(self):
+        while True:
+            settings = self.requests.get()
+            if settings != self.settings:
+                continue
+
+            prepared = prepare_game(self.word_lexicon, *settings, self.band)
+            with self.lock:
+                if settings == self.settings:
+                    self.prepared = prepared
@@ -0,0 +1,90 @@
+'''
+Measures how long each part of a frame takes, for the debug overlay and for trace files.
+'''
+import collections
+import contextlib
+import json
+import time
+
+# Amount of frames the rolling percentiles are taken over.
+HISTORY_LENGTH = 240
+
+
+def percentile(sorted_values, percent):
+    '''Returns the value at a percent of sorted values, without interpolating between values.'''
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))]
+
+
+class TraceWriter:
+    # Streams timed sections to a file in the Chrome trace event format, which chrome://tracing, Perfetto and
+    # speedscope can open. Events are written as they happen, so a long session isn't kept in memory.
+    def __init__(self, path):
+        self.file = open(path, "w")
+        self.file.write("[")
+        self.separator = "\n"
+
+    def write(self, name, start, duration, category="frame"):
+        '''Writes a complete event, with its start and duration in seconds.'''
+        event = {"name": name, "cat": category, "ph": "X", "ts": round(start * 1e6, 1),
+                 "dur": round(duration * 1e6, 1), "pid": 1, "tid": 1}
+        self.file.write(self.separator + json.dumps(event, separators=(",", ":")))
+        self.separator = ",\n"
+
+    def close(self):
+        self.file.write("\n]\n")
+        self.file.close()
+
+
+class FrameProfiler:
+    '''
+    Times named sections of every frame and keeps the times of the last HISTORY_LENGTH frames.
+
+    The frame time is the sum of its sections, so the time the loop spends waiting for events isn't counted.
+    A frame counts as dropped if it took longer than the time one frame has at the FPS cap.
+    '''
+    def __init__(self, fps, sections, trace_writer=None):
+        self.frame_budget = 1 / fps
+        self.sections = sections
+        self.trace_writer = trace_writer
+        self.start_time = time.perf_counter()
+        self.history = {name: collections.deque(maxlen=HISTORY_LENGTH) for name in ("frame",) + tuple(sections)}
+        self.frame_times = dict.fromkeys(sections, 0)
+        self.frame_count = 0
+        self.dropped_frames = 0
+
+    @contextlib.contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.frame_times[name] += duration
+            if self.trace_writer is not None:
+                self.trace_writer.write(name, start - self.start_time, duration)
+
+    def end_frame(self):
+        '''Saves the times of the frame's sections and starts the next frame.'''
+        frame_time = 0
+        for name, duration in self.frame_times.items():
+            self.history[name].append(duration)
+            frame_time += duration
+            self.frame_times[name] = 0
+        self.history["frame"].append(frame_time)
+
+        self.frame_count += 1
+        if frame_time > self.frame_budget:
+            self.dropped_frames += 1
+
+    def report(self):
+        '''Returns the last time, rolling p50 and rolling p99 of the frame and every section as lines of text.'''
+        if self.frame_count == 0:
+            return ["no frames yet"]
+
+        lines = [f"{'':<9}{'last':>7}{'p50':>7}{'p99':>7} ms"]
+        for name, times in self.history.items():
+            sorted_times = sorted(times)
+            lines.append(f"{name:<9}{times[-1] * 1000:7.2f}{percentile(sorted_times, 50) * 1000:7.2f}"
+                         f"{percentile(sorted_times, 99) * 1000:7.2f}")
+        lines.append(f"dropped {self.dropped_frames} of {self.frame_count} frames")
+        return lines
@@ -0,0 +1,143 @@
+'''
+Records the input events and answers of a game session to a compact binary log, so it can be replayed by replay.py.
+
+A log starts with a header of the settings the session started with, followed by records of a one byte kind and
+a fixed payload:
+    K  a key press: key code and the code point of its character, or -1 if it has none
+    D  a mouse button press: button and position
+    U  a mouse button release: button and position
+    Q  the window was closed
+    R  the window was resized to a width and height
+    A  the answer of a game that was started, or of one of its boards if it has several
+    S  the board and score when a game ended or the session was closed, to check a replay against, once for
+       every board of games with several boards
+'''
+import struct
+
+import pygame
+
+import gameplay
+
+MAGIC = b"WRL3"
+# Magic, word length, guesses, hard mode and amount of boards of the main menu when the session started, and the size
+# of the window.
+HEADER = struct.Struct("<4sBB?BHH")
+KEY = struct.Struct("<ii")
+MOUSE_BUTTON = struct.Struct("<Bhh")
+WINDOW_SIZE = struct.Struct("<HH")
+# Word length, guesses and score of a board, which is followed by its letters and its colors.
+BOARD = struct.Struct("<BBi")
+
+
+class Board:
+    # What a replay checks a board against: its letters and colors as bytes, and its score.
+    __slots__ = ("length", "max_guesses", "letters", "colors", "score")
+
+    def __init__(self, length, max_guesses, letters, colors, score):
+        self.length = length
+        self.max_guesses = max_guesses
+        self.letters = letters
+        self.colors = colors
+        self.score = score
+
+    @classmethod
+    def from_game(cls, game):
+        return cls(game.length, game.max_guesses, bytes(game.letters), bytes(game.colors), gameplay.score(game))
+
+    def __eq__(self, other):
+        return (self.length, self.max_guesses, self.letters, self.colors, self.score) == \
+            (other.length, other.max_guesses, other.letters, other.colors, other.score)
+
+    def describe(self):
+        rows = []
+        for row in range(self.max_guesses):
+            start = row * self.length
+            word = self.letters[start:start + self.length].rstrip(b"\0").decode("ascii")
+            if word:
+                rows.append(f"{word}:{self.colors[start:start + self.length].hex()}")
+        return f"{' '.join(rows) or 'empty board'}, score {self.score}"
+
+
+class SessionRecorder:
+    '''Writes the events handled by main.py to a session log as they happen.'''
+    def __init__(self, path, length, guesses, hard_mode, board_count=1, window_size=(800, 800)):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, length, guesses, hard_mode, board_count, *window_size))
+
+    def record_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            code_point = ord(event.unicode) if len(event.unicode) == 1 else -1
+            self.file.write(b"K" + KEY.pack(event.key, code_point))
+        elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            kind = b"D" if event.type == pygame.MOUSEBUTTONDOWN else b"U"
+            self.file.write(kind + MOUSE_BUTTON.pack(event.button, *event.pos))
+        elif event.type == pygame.QUIT:
+            self.file.write(b"Q")
+        elif event.type == pygame.VIDEORESIZE:
+            self.file.write(b"R" + WINDOW_SIZE.pack(event.w, event.h))
+
+    def record_answer(self, answer):
+        encoded_answer = answer.encode("ascii")
+        self.file.write(b"A" + bytes([len(encoded_answer)]) + encoded_answer)
+
+    def record_board(self, game):
+        board = Board.from_game(game)
+        self.file.write(b"S" + BOARD.pack(board.length, board.max_guesses, board.score) + board.letters + board.colors)
+
+    def close(self, boards):
+        '''Saves the boards the session ended on and closes the log.'''
+        for board in boards:
+            self.record_board(board)
+        self.file.close()
+
+
+def read_session(path):
+    '''
+    Reads a session log and returns its header settings as (length, guesses, hard mode, amount of boards,
+    window size), its events as pygame events, the answers of its games and the boards it recorded, in order.
+    '''
+    with open(path, "rb") as log_file:
+        data = log_file.read()
+
+    magic, length, guesses, hard_mode, board_count, *window_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a session log")
+
+    events = []
+    answers = []
+    boards = []
+    offset = HEADER.size
+    while offset < len(data):
+        kind = data[offset:offset + 1]
+        offset += 1
+        if kind == b"K":
+            key, code_point = KEY.unpack_from(data, offset)
+            offset += KEY.size
+            unicode = chr(code_point) if code_point >= 0 else ""
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0, scancode=0))
+        elif kind in (b"D", b"U"):
+            button, x, y = MOUSE_BUTTON.unpack_from(data, offset)
+            offset += MOUSE_BUTTON.size
+            event_type = pygame.MOUSEBUTTONDOWN if kind == b"D" else pygame.MOUSEBUTTONUP
+            events.append(pygame.event.Event(event_type, button=button, pos=(x, y)))
+        elif kind == b"Q":
+            events.append(pygame.event.Event(pygame.QUIT))
+        elif kind == b"R":
+            width, height = WINDOW_SIZE.unpack_from(data, offset)
+            offset += WINDOW_SIZE.size
+            events.append(pygame.event.Event(pygame.VIDEORESIZE, w=width, h=height, size=(width, height)))
+        elif kind == b"A":
+            answer_length = data[offset]
+            answers.append(data[offset + 1:offset + 1 + answer_length].decode("ascii"))
+            offset += 1 + answer_length
+        elif kind == b"S":
+            board_length, max_guesses, score = BOARD.unpack_from(data, offset)
+            offset += BOARD.size
+            cells = board_length * max_guesses
+            boards.append(Board(board_length, max_guesses, data[offset:offset + cells],
+                                data[offset + cells:offset + 2 * cells], score))
+            offset += 2 * cells
+        else:
+            raise ValueError(f"{path} has an unknown record {kind!r} at byte {offset - 1}")
+
+    return (length, guesses, hard_mode, board_count, window_size), events, answers, boards
@@ -0,0 +1,114 @@
+'''
+Caches of rendered surfaces, so text and tiles that don't change are only rasterized once.
+'''
+import math
+from collections import OrderedDict
+
+import pygame
+
+
+class SurfaceCache:
+    # Keeps surfaces by key and evicts the least recently used surface once max_size is reached.
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, create):
+        '''Returns the surface saved under key, or creates it with create() and saves it.'''
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = create()
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def __contains__(self, key):
+        return key in self.surfaces
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class GlyphCache(SurfaceCache):
+    # Caches antialiased text keyed by (font, text, color).
+    def __init__(self, max_size=512):
+        super().__init__(max_size)
+
+    def render(self, font, text, color):
+        '''Works like font.render(text, True, color), but only renders each combination once.'''
+        return self.get((font, text, tuple(color)), lambda: font.render(text, True, color))
+
+
+class TileCache(SurfaceCache):
+    '''
+    Caches finished tiles with their letter already drawn on, keyed by (letter, tile color, tile size).
+
+    tile_images maps each tile color name to its sprite and make_font(size) returns the letter font for a tile size.
+    '''
+    def __init__(self, tile_images, make_font, text_color, max_size=512):
+        super().__init__(max_size)
+        self.tile_images = tile_images
+        self.make_font = make_font
+        self.text_color = text_color
+        self.fonts = {}
+
+    def tile(self, letter, tile_color, tile_size):
+        '''Returns the surface of a tile with a letter on it.'''
+        return self.get((letter, tile_color, tile_size), lambda: self.bake(letter, tile_color, tile_size))
+
+    def bake(self, letter, tile_color, tile_size):
+        image = self.tile_images[tile_color]
+        if image.get_width() == tile_size:
+            surface = image.copy()
+        else:
+            surface = pygame.transform.smoothscale(image, (tile_size, tile_size))
+
+        if tile_size not in self.fonts:
+            self.fonts[tile_size] = self.make_font(tile_size)
+        render_text = self.fonts[tile_size].render(letter, True, self.text_color)
+
+        # Same placement as the original 64 pixel tiles, scaled to the tile size.
+        text_coords = (tile_size - render_text.get_width()) / 2, 5 * tile_size / 64
+        surface.blit(render_text, text_coords)
+        return surface
+
+
+class FlipCache(SurfaceCache):
+    '''
+    Caches the frames of a tile flipping over to show its color, keyed by (letter, tile color, tile size).
+
+    The first half of the frames squash the unrevealed tile from tile_cache to a line, and the second half open it
+    up again in its tile color. Every frame has the size of the tile, so it can be drawn in the tile's place.
+    '''
+    def __init__(self, tile_cache, frame_count=12, max_size=128):
+        super().__init__(max_size)
+        self.tile_cache = tile_cache
+        self.frame_count = frame_count
+
+    def frames(self, letter, tile_color, tile_size):
+        return self.get((letter, tile_color, tile_size), lambda: self.bake(letter, tile_color, tile_size))
+
+    def is_baked(self, letter, tile_color, tile_size):
+        return (letter, tile_color, tile_size) in self
+
+    def bake(self, letter, tile_color, tile_size):
+        front = self.tile_cache.tile(letter, "", tile_size)
+        back = self.tile_cache.tile(letter, tile_color, tile_size)
+        frames = []
+        for i in range(self.frame_count):
+            # The height follows a turning card, which is flat halfway through the flip.
+            turn = (i + 0.5) / self.frame_count
+            height = max(1, round(tile_size * abs(math.cos(math.pi * turn))))
+            image = front if turn < 0.5 else back
+            frame = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+            frame.blit(pygame.transform.smoothscale(image, (tile_size, height)), (0, (tile_size - height) // 2))
+            frames.append(frame)
+        return frames
@@ -0,0 +1,96 @@
+'''
+A retained mode renderer that only repaints the parts of the screen that changed since the last frame.
+'''
+import pygame
+
+
+def merge_rects(rects):
+    '''Merges overlapping rects into their union and drops empty ones, so no area is repainted twice.'''
+    merged = []
+    for rect in rects:
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect = rect.union(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class RetainedRenderer:
+    '''
+    Keeps the display list of the last frame and compares it with the display list of the current frame.
+
+    Every frame each visible item is added with a key, its rect, a state that fully describes how it looks and a
+    function that draws it. Items that were added, removed, moved or changed state mark their rects as dirty.
+    Each dirty rect is then cleared and every item touching it is drawn again in order, clipped to the rect.
+    '''
+    def __init__(self, surface, background_color):
+        self.surface = surface
+        self.background_color = background_color
+        self.items = {}
+        self.previous_items = {}
+        self.needs_full_redraw = True
+
+    def begin_frame(self):
+        self.items = {}
+
+    def add(self, key, rect, state, draw):
+        '''
+        Adds an item to the current frame. Items are drawn in the order they are first added,
+        and adding a key again in the same frame replaces the item but keeps its place.
+        '''
+        self.items[key] = (pygame.Rect(rect), state, draw)
+
+    def blit(self, key, image, coords):
+        '''Adds an image at coords to the current frame.'''
+        rect = image.get_rect(topleft=coords)
+        self.add(key, rect, image, lambda: self.surface.blit(image, rect))
+
+    def invalidate(self):
+        '''Makes the next frame repaint the whole screen.'''
+        self.needs_full_redraw = True
+
+    def dirty_rects(self):
+        '''Returns the merged rects that changed between the last frame and the current frame.'''
+        if self.needs_full_redraw:
+            return [self.surface.get_rect()]
+
+        rects = []
+        for key, (rect, state, draw) in self.items.items():
+            previous = self.previous_items.get(key)
+            if previous is None:
+                rects.append(rect)
+
+            elif previous != (rect, state):
+                rects.append(previous[0])
+                rects.append(rect)
+
+        for key, (rect, state) in self.previous_items.items():
+            if key not in self.items:
+                rects.append(rect)
+
+        screen_rect = self.surface.get_rect()
+        return merge_rects([rect.clip(screen_rect) for rect in rects])
+
+    def end_frame(self):
+        '''Repaints the dirty rects, pushes them to the display and returns them.'''
+        rects = self.dirty_rects()
+        for dirty_rect in rects:
+            self.surface.set_clip(dirty_rect)
+            self.surface.fill(self.background_color, dirty_rect)
+            for rect, state, draw in self.items.values():
+                if rect.colliderect(dirty_rect):
+                    draw()
+        self.surface.set_clip(None)
+
+        self.previous_items = {key: (rect, state) for key, (rect, state, draw) in self.items.items()}
+        self.needs_full_redraw = False
+        if rects:
+            pygame.display.update(rects)
+        return rects
@@ -0,0 +1,134 @@
+'''
+Replays session logs recorded with main.py --record through the event handling of main.py, without a window and
+as fast as the CPU allows. Every game has to end on the same board and score as when it was recorded.
+
+Usage:
+    python replay.py session.wrl [sessions/ ...]
+'''
+import argparse
+import os
+import sys
+import time
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Paths on the command line are relative to where replay.py was started, not to the repository.
+START_DIRECTORY = os.getcwd()
+# main.py loads its assets with paths relative to the repository.
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+import gameplay
+import main
+import recording
+
+
+class ReplayPreloader:
+    # Stands in for main.game_preloader and starts every game with the next answer of the session log.
+    def __init__(self, word_lexicon, answers):
+        self.word_lexicon = word_lexicon
+        self.answers = iter(answers)
+        # The recorded answers are replayed, whatever difficulty band they were picked from.
+        self.band = None
+
+    def request(self, length, guesses):
+        pass
+
+    def take(self, length, guesses):
+        return gameplay.new_game(self.word_lexicon, length, guesses, next(self.answers))
+
+    def take_answers(self, length, count, exclude=()):
+        return [next(self.answers) for i in range(count)]
+
+
+class ReplayChecker:
+    # Stands in for main.session_recorder and compares every board main.py would record with the session log.
+    def __init__(self, boards):
+        self.boards = boards
+        self.board_count = 0
+        self.mismatches = []
+
+    def record_event(self, event):
+        pass
+
+    def record_answer(self, answer):
+        pass
+
+    def record_board(self, game):
+        board = recording.Board.from_game(game)
+        if self.board_count >= len(self.boards):
+            self.mismatches.append(f"board {self.board_count + 1} wasn't recorded: {board.describe()}")
+        elif board != self.boards[self.board_count]:
+            self.mismatches.append(f"board {self.board_count + 1} was {self.boards[self.board_count].describe()}, "
+                                   f"but the replay got {board.describe()}")
+        self.board_count += 1
+
+    def close(self, boards):
+        for board in boards:
+            self.record_board(board)
+        if self.board_count < len(self.boards):
+            self.mismatches.append(f"{len(self.boards) - self.board_count} recorded boards were never reached")
+
+
+def replay_session(path):
+    '''Replays a session log and returns the amount of events and a list of the boards that didn't match.'''
+    (length, guesses, hard_mode, board_count, window_size), events, answers, boards = recording.read_session(path)
+    main.game_preloader = ReplayPreloader(main.word_lexicon, answers)
+    checker = main.session_recorder = ReplayChecker(boards)
+    # Replayed games aren't saved to the statistics of the player.
+    main.stats_log = None
+    main.num_of_letters = main.num_of_tiles_in_row = length
+    main.guesses = main.num_of_rows = guesses
+    main.hard_mode = main.hard_mode_button.is_selected = hard_mode
+    main.board_count = board_count
+    # Recorded clicks are in pixels of the window, so the buttons have to be laid out for the same size.
+    if (main.screen_layout.width, main.screen_layout.height) != tuple(window_size):
+        main.resize(*window_size)
+    main.main_menu()
+
+    for event in events:
+        main.event = event
+        main.handle_event()
+        # Hints only show a message and never change the board, so they are thrown away instead of ranked.
+        main.hint_service.cancel()
+        if not main.is_application_running:
+            break
+
+    checker.close(main.game_boards())
+    return len(events), checker.mismatches
+
+
+def find_session_logs(paths):
+    '''Returns the given session logs, with directories replaced by the .wrl files in them.'''
+    session_logs = []
+    for path in paths:
+        if os.path.isdir(path):
+            session_logs.extend(sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".wrl")))
+        else:
+            session_logs.append(path)
+    return session_logs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replays recorded sessions and checks that they end the same way.")
+    parser.add_argument("paths", nargs="+", help="session logs, or directories of them")
+    args = parser.parse_args()
+
+    main.buttons_init()
+    total_events = 0
+    failed_sessions = 0
+    start_time = time.perf_counter()
+    session_paths = find_session_logs(os.path.join(START_DIRECTORY, path) for path in args.paths)
+    for session_path in session_paths:
+        event_count, mismatches = replay_session(session_path)
+        total_events += event_count
+        if mismatches:
+            failed_sessions += 1
+            print(f"{session_path}:")
+            for mismatch in mismatches:
+                print(f"    {mismatch}")
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Replayed {len(session_paths)} sessions with {total_events} events in {elapsed:.2f}s "
+          f"({total_events / max(elapsed, 1e-9):.0f} events/s), {failed_sessions} didn't match")
+    if failed_sessions:
+        sys.exit(1)
@@ -0,0 +1,63 @@
+'''
+The game rules without any pygame dependency.
+
+Feedback for a guess is a list of color codes, one per letter. A whole row of feedback can also be packed
+into a single integer pattern, where each letter is a base 3 digit with the first letter as the lowest digit.
+'''
+
+GRAY = 0
+YELLOW = 1
+GREEN = 2
+
+# Maps color codes to the color names used for the tiles.
+COLOR_NAMES = ("gray", "yellow", "green")
+
+
+def score_word(guess, answer):
+    '''
+    Takes a guess and the answer and returns the color code of each letter in the guess.
+
+    A letter is green if it is on the right spot, yellow if it is anywhere else in the answer and gray otherwise.
+    '''
+    codes = []
+    for letter in range(len(guess)):
+        if guess[letter] == answer[letter]:
+            codes.append(GREEN)
+
+        elif guess[letter] in answer:
+            codes.append(YELLOW)
+
+        else:
+            codes.append(GRAY)
+    return codes
+
+
+def encode_pattern(codes):
+    '''Packs a list of color codes into a single integer.'''
+    pattern = 0
+    for code in reversed(codes):
+        pattern = pattern * 3 + code
+    return pattern
+
+
+def decode_pattern(pattern, length):
+    '''Unpacks an integer pattern into a list of color codes.'''
+    codes = []
+    for i in range(length):
+        codes.append(pattern % 3)
+        pattern //= 3
+    return codes
+
+
+def score_pattern(guess, answer):
+    '''Returns the feedback of a guess as a packed integer pattern.'''
+    return encode_pattern(score_word(guess, answer))
+
+
+def calculate_score(green_letters, yellow_letters, length, guesses, made_guesses):
+    '''
+    Calculates the score of a finished game from the amount of green and yellow tiles on the board,
+    the word length, the amount of guesses the game had and the amount of guesses that were made.
+    '''
+    return (green_letters * length * 50) + (yellow_letters * (length * 40)) - (
+            made_guesses * (guesses - made_guesses) * 30)
@@ -0,0 +1,39 @@
+'''
+Decides how long the main loop sleeps between frames.
+'''
+import pygame
+
+
+def allow_only(event_types):
+    '''Blocks every event type except the given ones from being put on the event queue.'''
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(event_types))
+
+
+class FrameScheduler:
+    '''
+    Uses one persistent clock for the whole run.
+
+    While something is animating the loop runs at up to fps frames a second. Otherwise the loop blocks in
+    pygame.event.wait until an event arrives or until wake_up_time (in pygame ticks), if one is given.
+    '''
+    def __init__(self, fps=60):
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+
+    def next_events(self, is_animating, wake_up_time=None):
+        '''Waits for the next frame and returns the events that arrived in the meantime.'''
+        if is_animating:
+            self.clock.tick(self.fps)
+            return pygame.event.get()
+
+        if wake_up_time is None:
+            first_event = pygame.event.wait()
+        else:
+            first_event = pygame.event.wait(max(1, wake_up_time - pygame.time.get_ticks()))
+
+        # Keeps the clock in step, so the first animated frame after an idle period isn't delayed.
+        self.clock.tick()
+        if first_event.type == pygame.NOEVENT:
+            return pygame.event.get()
+        return [first_event] + pygame.event.get()
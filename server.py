@@ -0,0 +1,274 @@
+'''
+Runs the game logic as an asyncio TCP service, so many players can play at once from their own clients.
+
+Every message is one JSON object on its own line, in both directions. Requests name a command:
+    {"command": "lengths"}                          -> {"ok": true, "lengths": [4, 5, 6, 7]}
+    {"command": "new", "length": 5, "guesses": 7, "hard_mode": false}
+                                                    -> {"ok": true, "length": 5, "guesses": 7, "hard_mode": false}
+    {"command": "guess", "word": "crane"}           -> {"ok": true, "result": "accepted", "colors": [...], ...}
+    {"command": "state"}                            -> {"ok": true, "rows": [...], "colors": [...], ...}
+Finished games also send their score and answer. Failed requests get {"ok": false, "error": "..."}.
+
+Usage:
+    python server.py [--host 127.0.0.1] [--port 8765]
+    python server.py --load-test 1000
+'''
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import gameplay
+import lexicon
+from game_state import COLOR_NAMES
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Longest request line that is read, so a client can't make a session buffer without limit.
+MAX_LINE_LENGTH = 4096
+
+
+class RequestError(Exception):
+    pass
+
+
+class Session:
+    # The game of one connection.
+    __slots__ = ("state",)
+
+    def __init__(self):
+        self.state = None
+
+
+def describe_game(state):
+    '''Returns what a client needs to draw a game.'''
+    status = gameplay.game_status(state)
+    description = {
+        "length": state.length,
+        "guesses": state.max_guesses,
+        "rows": [state.row_word(row) for row in range(state.guess_count)],
+        "colors": [[COLOR_NAMES[state.tile_color(row, column)] for column in range(state.length)]
+                   for row in range(state.guess_count)],
+        "keyboard": {chr(ord("A") + key): COLOR_NAMES[code] for key, code in enumerate(state.keyboard) if code},
+        "possible_answers": gameplay.possible_answers(state),
+        "status": status,
+    }
+    if status != gameplay.PLAYING:
+        description["score"] = gameplay.score(state)
+        description["answer"] = state.answer
+    return description
+
+
+class GameServer:
+    '''
+    Serves a game to every connection. All sessions share one lexicon, whose word lists and indexes are opened
+    on a worker thread the first time a length is played, so the event loop never waits on them.
+    '''
+    def __init__(self, word_lexicon=None):
+        if word_lexicon is None:
+            word_lexicon = lexicon.Lexicon()
+        self.word_lexicon = word_lexicon
+        self.lengths = word_lexicon.available_lengths()
+        self.session_count = 0
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE_LENGTH)
+        return self.server
+
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def prepare_length(self, length):
+        # Opens the word lists and builds everything gameplay.new_game reads, so none of it happens on the event loop.
+        self.word_lexicon.candidate_index(length)
+        self.word_lexicon.difficulty_index(length)
+
+    async def load_length(self, length):
+        '''Opens the word lists of a length and builds its indexes without blocking the event loop.'''
+        if length not in self.word_lexicon.candidate_indexes:
+            await asyncio.get_running_loop().run_in_executor(None, self.prepare_length, length)
+
+    async def handle_connection(self, reader, writer):
+        session = Session()
+        self.session_count += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The line was longer than MAX_LINE_LENGTH, so the rest of the stream can't be trusted.
+                    writer.write(encode_message({"ok": False, "error": "request is too long"}))
+                    break
+                if not line:
+                    break
+
+                writer.write(encode_message(await self.handle_request(session, line)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.session_count -= 1
+            writer.close()
+
+    async def handle_request(self, session, line):
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise RequestError("request is not JSON")
+            if not isinstance(request, dict):
+                raise RequestError("request is not a JSON object")
+
+            command = request.get("command")
+            if command == "lengths":
+                response = {"lengths": self.lengths}
+            elif command == "new":
+                response = await self.new_game(session, request)
+            elif command == "guess":
+                response = self.guess(session, request)
+            elif command == "state":
+                response = describe_game(self.current_game(session))
+            else:
+                raise RequestError(f"unknown command {command!r}")
+        except RequestError as error:
+            return {"ok": False, "error": str(error)}
+
+        response["ok"] = True
+        return response
+
+    async def new_game(self, session, request):
+        length = request.get("length", 5)
+        guesses = request.get("guesses", gameplay.MAX_GUESSES)
+        hard_mode = request.get("hard_mode", False)
+        if not isinstance(length, int) or isinstance(length, bool) or length not in self.lengths:
+            raise RequestError(f"word length must be one of {self.lengths}")
+        if not (isinstance(guesses, int) and gameplay.MIN_GUESSES <= guesses <= gameplay.MAX_GUESSES):
+            raise RequestError(f"guesses must be from {gameplay.MIN_GUESSES} to {gameplay.MAX_GUESSES}")
+        if not isinstance(hard_mode, bool):
+            raise RequestError("hard_mode must be true or false")
+
+        await self.load_length(length)
+        session.state = gameplay.new_game(self.word_lexicon, length, guesses, hard_mode=hard_mode)
+        return {"length": length, "guesses": guesses, "hard_mode": hard_mode}
+
+    def guess(self, session, request):
+        state = self.current_game(session)
+        if gameplay.game_status(state) != gameplay.PLAYING:
+            raise RequestError("the game is over")
+
+        word = request.get("word")
+        if not (isinstance(word, str) and word.isascii() and word.isalpha()):
+            raise RequestError("word must be made of the letters A-Z")
+
+        # The word lists are already open, since the game was started, so checking a guess is only a binary search.
+        result, color_codes = gameplay.submit_word(state, word.upper(), self.word_lexicon)
+        response = describe_game(state)
+        response["result"] = result
+        if color_codes is not None:
+            response["feedback"] = [COLOR_NAMES[code + 1] for code in color_codes]
+        return response
+
+    def current_game(self, session):
+        if session.state is None:
+            raise RequestError("no game has been started")
+        return session.state
+
+
+def encode_message(message):
+    return json.dumps(message, separators=(",", ":")).encode("ascii") + b"\n"
+
+
+class GameClient:
+    # A client for the server, used by the load test and for trying the server out from a Python shell.
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, command, **fields):
+        '''Sends a command and returns the response of the server.'''
+        fields["command"] = command
+        self.writer.write(encode_message(fields))
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def play_random_game(client, word_lexicon, length, guesses, rng):
+    '''Plays one game with random check words and returns the amount of requests that were sent.'''
+    await client.request("new", length=length, guesses=guesses)
+    check_words = word_lexicon.check_words(length)
+    request_count = 1
+    while True:
+        response = await client.request("guess", word=check_words.random_word(rng))
+        request_count += 1
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        if response["status"] != gameplay.PLAYING:
+            return request_count
+
+
+async def load_test(num_of_clients, length=5, guesses=gameplay.MAX_GUESSES, games_per_client=3):
+    '''Starts a server on a free port, connects many clients at once and reports how fast they were served.'''
+    game_server = GameServer()
+    await game_server.start(port=0)
+    await game_server.load_length(length)
+    port = game_server.port()
+
+    async def run_client(seed):
+        rng = random.Random(seed)
+        client = await GameClient.connect(port=port)
+        try:
+            request_count = 0
+            for _ in range(games_per_client):
+                request_count += await play_random_game(client, game_server.word_lexicon, length, guesses, rng)
+            return request_count
+        finally:
+            await client.close()
+
+    start_time = time.perf_counter()
+    request_counts = await asyncio.gather(*(run_client(seed) for seed in range(num_of_clients)))
+    elapsed = time.perf_counter() - start_time
+    await game_server.close()
+
+    total_requests = sum(request_counts)
+    print(f"{num_of_clients} clients played {num_of_clients * games_per_client} games "
+          f"with {total_requests} requests in {elapsed:.2f}s ({total_requests / elapsed:.0f} requests/s)")
+
+
+async def serve(host, port):
+    game_server = GameServer()
+    server = await game_server.start(host, port)
+    print(f"Serving on {host}:{game_server.port()}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serves the game over TCP, one JSON message per line.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--load-test", type=int, metavar="CLIENTS",
+                        help="instead of serving, play games with this many local clients at once")
+    args = parser.parse_args()
+
+    try:
+        if args.load_test:
+            asyncio.run(load_test(args.load_test))
+        else:
+            asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,232 @@
+'''
+Plays complete games headlessly with a guessing strategy, for every pick word and every word length and
+guess amount the main menu offers, spread over a pool of worker processes.
+
+Every game is written to the output file as it finishes, as a fixed width record of RESULT,
+and the report is counted from those records, so no run holds its games in memory.
+Scores use the same formula as the won and lost screens.
+
+Usage:
+    python simulator.py [--strategy candidates] [--lengths 5 6] [--guesses 6 7] [--repeat 10]
+'''
+import argparse
+import collections
+import multiprocessing
+import os
+import random
+import struct
+import sys
+import time
+
+import gameplay
+import lexicon
+
+OUTPUT_PATH = os.path.join("simulations", "results.bin")
+# Word length, guess amount, index of the answer in the pick words, guesses made, 1 if won, score.
+RESULT = struct.Struct("<BBIBBi")
+# Amount of answers played by one task of a worker.
+ANSWERS_PER_TASK = 64
+
+
+class RandomStrategy:
+    # Guesses random check words that haven't been guessed yet.
+    needs_pattern_table = False
+
+    def __init__(self, word_lexicon, length):
+        self.check_words = word_lexicon.check_words(length)
+
+    def next_guess(self, state, rng):
+        while True:
+            word = self.check_words.random_word(rng)
+            if not state.is_guessed(word):
+                return word
+
+
+class CandidateStrategy:
+    # Guesses a random pick word that would have given the same colors to every guess so far.
+    needs_pattern_table = True
+
+    def __init__(self, word_lexicon, length):
+        from pattern_matrix import load_pattern_table
+        from solver import candidate_mask
+        self.table = load_pattern_table(length)
+        self.candidate_mask = candidate_mask
+
+    def next_guess(self, state, rng):
+        candidates = self.candidate_mask(self.table, state.history()).nonzero()[0]
+        return self.table.answers[int(candidates[rng.randrange(len(candidates))])]
+
+
+class EntropyStrategy:
+    # Guesses the word with the highest expected information gain, like the hints do.
+    needs_pattern_table = True
+
+    def __init__(self, word_lexicon, length):
+        from pattern_matrix import load_pattern_table
+        from solver import rank_guesses
+        self.table = load_pattern_table(length)
+        self.rank_guesses = rank_guesses
+        # Every game starts from the same empty board, so the first guess is ranked once.
+        self.first_guess = None
+
+    def next_guess(self, state, rng):
+        if state.guess_count == 0 and self.first_guess is not None:
+            return self.first_guess
+
+        guess = self.rank_guesses(self.table, state.history(), limit=1)[0][0]
+        if state.guess_count == 0:
+            self.first_guess = guess
+        return guess
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "candidates": CandidateStrategy,
+    "entropy": EntropyStrategy,
+}
+
+# The lexicon and strategies of a worker process, set up once by init_worker.
+worker_lexicon = None
+worker_strategies = {}
+
+
+def init_worker(library_path):
+    global worker_lexicon
+    worker_lexicon = lexicon.Lexicon(library_path)
+    worker_strategies.clear()
+
+
+def play_game(strategy, word_lexicon, length, guesses, answer, rng):
+    '''Plays one game to its end and returns its state.'''
+    state = gameplay.new_game(word_lexicon, length, guesses, answer)
+    while gameplay.game_status(state) == gameplay.PLAYING:
+        word = strategy.next_guess(state, rng)
+        result, color_codes = gameplay.submit_word(state, word, word_lexicon)
+        if result != gameplay.ACCEPTED:
+            raise ValueError(f"{type(strategy).__name__} guessed {word!r}, which was {result}")
+    return state
+
+
+def play_task(task):
+    '''Plays the answers from start to stop of a word length and returns the packed records of the games.'''
+    strategy_name, length, guesses, start, stop, seed = task
+    strategy = worker_strategies.get((strategy_name, length))
+    if strategy is None:
+        strategy = worker_strategies[strategy_name, length] = STRATEGIES[strategy_name](worker_lexicon, length)
+
+    rng = random.Random(f"{seed}-{length}-{guesses}-{start}")
+    pick_words = worker_lexicon.pick_words(length)
+    records = bytearray()
+    for answer_index in range(start, stop):
+        state = play_game(strategy, worker_lexicon, length, guesses, pick_words[answer_index], rng)
+        records += RESULT.pack(length, guesses, answer_index, state.guess_count, state.is_won(),
+                               gameplay.score(state))
+    return bytes(records)
+
+
+def make_tasks(strategy_name, word_lexicon, lengths, guess_amounts, repeat, seed):
+    '''Splits every game of the run into tasks of up to ANSWERS_PER_TASK answers.'''
+    for repetition in range(repeat):
+        for length in lengths:
+            num_of_answers = len(word_lexicon.pick_words(length))
+            for guesses in guess_amounts:
+                for start in range(0, num_of_answers, ANSWERS_PER_TASK):
+                    yield (strategy_name, length, guesses, start, min(start + ANSWERS_PER_TASK, num_of_answers),
+                           f"{seed}-{repetition}")
+
+
+class Summary:
+    # Counts the results of every game with the same word length and guess amount.
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.made_guesses = collections.Counter()
+        self.scores = collections.Counter()
+
+    def add(self, made_guesses, won, score):
+        self.games += 1
+        self.wins += won
+        if won:
+            self.made_guesses[made_guesses] += 1
+        self.scores[score] += 1
+
+    def score_percentile(self, fraction):
+        '''Returns the score that the given fraction of the games scored at most.'''
+        target = fraction * self.games
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen >= target:
+                return score
+        return 0
+
+    def report(self):
+        mean_score = sum(score * count for score, count in self.scores.items()) / self.games
+        distribution = " ".join(f"{guess}:{self.made_guesses[guess]}" for guess in sorted(self.made_guesses))
+        return (f"win rate {self.wins / self.games:7.2%}  guesses when won {distribution or '-'}\n"
+                f"    score mean {mean_score:.0f}  min {min(self.scores)}  p10 {self.score_percentile(0.1)}  "
+                f"median {self.score_percentile(0.5)}  p90 {self.score_percentile(0.9)}  max {max(self.scores)}")
+
+
+def read_results(path):
+    '''Yields the (length, guesses, answer index, made guesses, won, score) of every game in a results file.'''
+    with open(path, "rb") as results_file:
+        while True:
+            data = results_file.read(RESULT.size * 4096)
+            if not data:
+                return
+            yield from RESULT.iter_unpack(data)
+
+
+def simulate(strategy_name, lengths, guess_amounts, repeat=1, output_path=OUTPUT_PATH, processes=None, seed=0,
+             library_path=lexicon.WORD_LIBRARY_PATH):
+    '''Plays every game of the run, writes each one to output_path and returns the summaries by (length, guesses).'''
+    word_lexicon = lexicon.Lexicon(library_path)
+    if STRATEGIES[strategy_name].needs_pattern_table:
+        # The matrices are built here first, so the workers don't all build and save them at once.
+        from pattern_matrix import load_pattern_table
+        for length in lengths:
+            load_pattern_table(length)
+
+    summaries = collections.defaultdict(Summary)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tasks = make_tasks(strategy_name, word_lexicon, lengths, guess_amounts, repeat, seed)
+    with open(output_path, "wb") as output_file, \
+            multiprocessing.Pool(processes, initializer=init_worker, initargs=(library_path,)) as pool:
+        for records in pool.imap_unordered(play_task, tasks):
+            output_file.write(records)
+            for length, guesses, answer_index, made_guesses, won, score in RESULT.iter_unpack(records):
+                summaries[length, guesses].add(made_guesses, won, score)
+    return summaries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays games with a guessing strategy and reports the results.")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="candidates")
+    parser.add_argument("--lengths", type=int, nargs="+", help="word lengths to play (default: all)")
+    parser.add_argument("--guesses", type=int, nargs="+",
+                        default=list(range(gameplay.MIN_GUESSES, gameplay.MAX_GUESSES + 1)),
+                        help="guess amounts to play (default: all the menu offers)")
+    parser.add_argument("--repeat", type=int, default=1, help="times every answer is played")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="file the game records are written to")
+    parser.add_argument("--processes", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    available_lengths = lexicon.Lexicon().available_lengths()
+    word_lengths = args.lengths or available_lengths
+    for word_length in word_lengths:
+        if word_length not in available_lengths:
+            print(f"error: there are no word lists of length {word_length}", file=sys.stderr)
+            sys.exit(1)
+
+    start_time = time.perf_counter()
+    run_summaries = simulate(args.strategy, word_lengths, args.guesses, args.repeat, args.output, args.processes,
+                             args.seed)
+    elapsed = time.perf_counter() - start_time
+
+    total_games = 0
+    for (word_length, guess_amount), summary in sorted(run_summaries.items()):
+        total_games += summary.games
+        print(f"{word_length} letters, {guess_amount} guesses: {summary.games} games, {summary.report()}")
+    print(f"{total_games} games in {elapsed:.1f}s ({total_games / elapsed:.0f} games/s), written to {args.output}")
@@ -0,0 +1,124 @@
+'''
+Ranks guesses by their expected information gain.
+
+The history of a board is a list of (guess, pattern) pairs, where pattern is the packed feedback from rules.py.
+The answers still possible are the pick words that would have given the same feedback to every guess so far, and
+each check word is ranked by the entropy of the patterns it would split those answers into.
+'''
+import logging
+import queue
+import threading
+
+import numpy as np
+
+from pattern_matrix import load_pattern_table
+
+# Amount of guesses scored between each check for cancellation.
+GUESSES_PER_CHUNK = 512
+
+logger = logging.getLogger("wordle.solver")
+
+
+def candidate_mask(table, history):
+    '''Returns a boolean mask over table.answers of the answers that match every guess in the history.'''
+    mask = np.ones(len(table.answers), dtype=bool)
+    for guess, pattern in history:
+        mask &= table.guess_patterns(guess) == pattern
+    return mask
+
+
+def pattern_entropy(patterns, num_of_patterns):
+    '''Returns the entropy in bits of the pattern distribution of each row in a guess x candidate matrix.'''
+    num_of_rows, num_of_candidates = patterns.shape
+    # Gives every row its own range of keys, so all rows can be counted with a single np.unique.
+    keys = patterns.astype(np.int64) + np.arange(num_of_rows, dtype=np.int64)[:, None] * num_of_patterns
+    unique_keys, counts = np.unique(keys, return_counts=True)
+    probabilities = counts / num_of_candidates
+    return np.bincount(unique_keys // num_of_patterns, weights=-probabilities * np.log2(probabilities),
+                       minlength=num_of_rows)
+
+
+def rank_guesses(table, history, limit=None, is_cancelled=None):
+    '''
+    Ranks every guess in the table by expected information gain and returns a list of (word, bits) pairs.
+    Guesses that could be the answer themselves win ties. Returns None if is_cancelled() turned True midway.
+    '''
+    candidates = np.flatnonzero(candidate_mask(table, history))
+    if len(candidates) == 0:
+        return []
+
+    num_of_patterns = 3 ** table.length
+    entropies = np.zeros(len(table.guesses))
+    for start in range(0, len(table.guesses), GUESSES_PER_CHUNK):
+        if is_cancelled is not None and is_cancelled():
+            return None
+        chunk = table.patterns(slice(start, start + GUESSES_PER_CHUNK), candidates)
+        entropies[start:start + GUESSES_PER_CHUNK] = pattern_entropy(chunk, num_of_patterns)
+
+    is_candidate = np.zeros(len(table.guesses), dtype=bool)
+    for i in candidates:
+        guess_index = table.guesses.index(table.answers[i])
+        if guess_index >= 0:
+            is_candidate[guess_index] = True
+
+    # np.lexsort sorts by the last key first, so this sorts by entropy and then by being a candidate.
+    order = np.lexsort((~is_candidate, -entropies))
+    if limit is not None:
+        order = order[:limit]
+    return [(table.guesses[i], float(entropies[i])) for i in order]
+
+
+def best_guess(length, history):
+    '''Returns the best next guess for a board with the given word length and history, or None if there is none.'''
+    ranking = rank_guesses(load_pattern_table(length), history, limit=1)
+    if ranking:
+        return ranking[0][0]
+    return None
+
+
+class HintService:
+    # Ranks guesses on a worker thread and passes each finished ranking to on_result(generation, ranking).
+    # Every new request or cancel starts a new generation, and work from an older generation is thrown away.
+    # A request that fails is logged and gets an empty ranking, so the service keeps answering later requests.
+    def __init__(self, on_result, limit=5):
+        self.on_result = on_result
+        self.limit = limit
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.tables = {}
+        self.worker = threading.Thread(target=self.run, name="hint-service", daemon=True)
+        self.worker.start()
+
+    def request(self, length, history):
+        '''Asks for a ranking of the board and returns the generation the result will be tagged with.'''
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+        self.requests.put((generation, length, list(history)))
+        return generation
+
+    def cancel(self):
+        '''Throws away any ranking that is queued or running.'''
+        with self.lock:
+            self.generation += 1
+
+    def is_stale(self, generation):
+        return generation != self.generation
+
+    def run(self):
+        while True:
+            generation, length, history = self.requests.get()
+            if self.is_stale(generation):
+                continue
+
+            try:
+                if length not in self.tables:
+                    self.tables[length] = load_pattern_table(length)
+                ranking = rank_guesses(self.tables[length], history, self.limit, lambda: self.is_stale(generation))
+            except Exception:
+                logger.exception("Ranking guesses of length %d failed", length)
+                ranking = []
+
+            if ranking is not None and not self.is_stale(generation):
+                self.on_result(generation, ranking)
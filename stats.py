@@ -0,0 +1,120 @@
+'''
+Saves the result of every finished game to an append-only log of fixed size records, and summarizes the log with
+numpy over a memory map, so the statistics of millions of games open without reading them into Python objects.
+
+The log is a 16 byte header followed by one RECORD per game, in the order the games ended.
+'''
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+import gameplay
+
+STATS_PATH = os.path.join("player_data", "game_results.bin")
+MAGIC = b"WST1"
+VERSION = 1
+# Magic and format version, padded to the size of a record.
+HEADER = struct.Struct("<4sH10x")
+# Unix time in seconds, word length, guesses the game had, guesses made, 1 if won, score.
+RECORD = struct.Struct("<qBBBBi")
+RECORD_DTYPE = np.dtype([("timestamp", "<i8"), ("length", "u1"), ("guesses", "u1"), ("made_guesses", "u1"),
+                         ("won", "u1"), ("score", "<i4")])
+
+
+class StatsError(Exception):
+    pass
+
+
+class StatsLog:
+    # Appends the results of finished games to the log at path, which is created the first time a game is saved.
+    def __init__(self, path=STATS_PATH):
+        self.path = path
+
+    def record(self, length, guesses, made_guesses, won, score, timestamp=None):
+        if timestamp is None:
+            timestamp = int(time.time())
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "ab") as log_file:
+            if log_file.tell() == 0:
+                log_file.write(HEADER.pack(MAGIC, VERSION))
+            log_file.write(RECORD.pack(timestamp, length, guesses, made_guesses, won, score))
+
+    def record_game(self, game):
+        '''Saves the result of a finished game.'''
+        self.record(game.length, game.max_guesses, game.guess_count, game.is_won(), gameplay.score(game))
+
+
+def load_results(path=STATS_PATH):
+    '''
+    Returns every saved game as a numpy record array of RECORD_DTYPE that reads straight from the memory mapped log.
+    A record that was only partly written, for example because the power went out, is left out.
+    '''
+    try:
+        with open(path, "rb") as log_file:
+            if os.fstat(log_file.fileno()).st_size <= HEADER.size:
+                return np.zeros(0, dtype=RECORD_DTYPE)
+            data = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise StatsError(f"{path} is not a version {VERSION} stats log")
+    count = (len(data) - HEADER.size) // RECORD.size
+    return np.frombuffer(data, dtype=RECORD_DTYPE, count=count, offset=HEADER.size)
+
+
+class StatsSummary:
+    '''
+    The statistics shown on the statistics screen, counted from the results of load_results:
+    totals, win streaks, how many guesses won games took and the averages of each word length.
+    '''
+    def __init__(self, results):
+        self.games = len(results)
+        won = results["won"].astype(bool)
+        self.wins = int(np.count_nonzero(won))
+
+        # Streaks are the runs of wins between losses.
+        losses = np.flatnonzero(~won)
+        runs = np.diff(np.concatenate(([-1], losses, [self.games]))) - 1
+        self.max_streak = int(runs.max()) if self.games else 0
+        self.current_streak = int(runs[-1]) if self.games else 0
+
+        # guess_counts[n] is the amount of won games that took n guesses.
+        self.guess_counts = np.bincount(results["made_guesses"][won], minlength=gameplay.MAX_GUESSES + 1)
+
+        # Maps each word length that was played to its (games, wins, mean score).
+        lengths = results["length"]
+        games_by_length = np.bincount(lengths)
+        wins_by_length = np.bincount(lengths, weights=won, minlength=len(games_by_length))
+        scores_by_length = np.bincount(lengths, weights=results["score"], minlength=len(games_by_length))
+        self.lengths = {}
+        for length in np.flatnonzero(games_by_length):
+            games = int(games_by_length[length])
+            self.lengths[int(length)] = (games, int(wins_by_length[length]), float(scores_by_length[length] / games))
+
+    def win_rate(self):
+        if self.games == 0:
+            return 0
+        return self.wins / self.games
+
+
+def summarize(path=STATS_PATH):
+    return StatsSummary(load_results(path))
+
+
+if __name__ == "__main__":
+    start_time = time.perf_counter()
+    summary = summarize()
+    elapsed = time.perf_counter() - start_time
+    print(f"{summary.games} games, {summary.win_rate():.1%} won, current streak {summary.current_streak}, "
+          f"max streak {summary.max_streak}")
+    print("guesses when won: " + " ".join(f"{guesses}:{count}" for guesses, count in enumerate(summary.guess_counts)
+                                          if count))
+    for word_length, (length_games, length_wins, mean_score) in sorted(summary.lengths.items()):
+        print(f"{word_length} letters: {length_games} games, {length_wins / length_games:.1%} won, "
+              f"mean score {mean_score:.0f}")
+    print(f"summarized in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,189 @@
+'''
+Plays the game in a terminal with curses, for machines without a display or without pygame.
+
+The game rules come from the same pure Python modules as the pygame client and the server (gameplay, lexicon,
+game_state, candidates and rules), so answers, accepted words, colors, the keyboard and the score are the same.
+Nothing here imports pygame or numpy. Every key press draws the screen into curses' virtual screen, and curses only
+sends the cells that changed to the terminal.
+
+Usage:
+    python terminal.py [--length 5] [--guesses 7] [--hard] [--difficulty hard]
+'''
+import argparse
+import curses
+import sys
+
+import difficulty
+import gameplay
+import lexicon
+
+KEYBOARD_ROWS = ("QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM")
+# Every tile is three cells wide, with the letter in the middle.
+TILE_WIDTH = 3
+
+# The messages of the pygame client for words that weren't accepted.
+RESULT_MESSAGES = {
+    gameplay.TOO_SHORT: "The word is too short!",
+    gameplay.NOT_A_WORD: "The word wasn't recognized!",
+    gameplay.ALREADY_GUESSED: "The word has already been guessed on!",
+    gameplay.IGNORES_CLUES: "Hard mode: the word has to use every clue!",
+}
+MAX_LENGTH_MESSAGE = "Max word length reached!"
+
+ENTER_KEYS = ("\n", "\r", curses.KEY_ENTER)
+BACKSPACE_KEYS = ("\b", "\x7f", curses.KEY_BACKSPACE)
+ESCAPE_KEY = "\x1b"
+
+
+def color_attributes():
+    '''
+    Returns the curses attributes of tiles and of keys by the color codes of game_state.
+    Terminals without colors get reverse video for green, underlines for yellow and dim text for gray.
+    '''
+    if not curses.has_colors():
+        tiles = (curses.A_BOLD, curses.A_DIM, curses.A_UNDERLINE, curses.A_REVERSE)
+        return tiles, (curses.A_NORMAL,) + tiles[1:]
+
+    curses.start_color()
+    curses.use_default_colors()
+    for pair, color in enumerate((curses.COLOR_WHITE, curses.COLOR_YELLOW, curses.COLOR_GREEN), start=1):
+        curses.init_pair(pair, curses.COLOR_BLACK, color)
+        curses.init_pair(pair + 3, color, -1)
+    tiles = (curses.A_BOLD,) + tuple(curses.color_pair(pair) | curses.A_BOLD for pair in (1, 2, 3))
+    keys = (curses.A_BOLD, curses.A_DIM) + tuple(curses.color_pair(pair) | curses.A_BOLD for pair in (5, 6))
+    return tiles, keys
+
+
+class TerminalGame:
+    # The game that is being played in the terminal, with the message shown under the grid.
+    def __init__(self, word_lexicon, length, guesses, hard_mode, band):
+        self.word_lexicon = word_lexicon
+        self.length = length
+        self.guesses = guesses
+        self.hard_mode = hard_mode
+        self.band = band
+        self.state = None
+        self.message = ""
+        self.new_game()
+
+    def new_game(self):
+        self.state = gameplay.new_game(self.word_lexicon, self.length, self.guesses, hard_mode=self.hard_mode,
+                                       band=self.band)
+        self.message = ""
+
+    def status(self):
+        return gameplay.game_status(self.state)
+
+    def handle_key(self, key):
+        '''Handles a key press and returns False if the game should close.'''
+        if key == ESCAPE_KEY:
+            return False
+
+        if self.status() != gameplay.PLAYING:
+            if key in ENTER_KEYS:
+                self.new_game()
+            return True
+
+        self.message = ""
+        if key in ENTER_KEYS:
+            self.submit()
+        elif key in BACKSPACE_KEYS:
+            self.state.remove_letter()
+        elif isinstance(key, str) and key.isascii() and key.isalpha():
+            if not self.state.type_letter(key.upper()):
+                self.message = MAX_LENGTH_MESSAGE
+        return True
+
+    def submit(self):
+        result, color_codes = gameplay.submit_word(self.state, self.state.written_word(), self.word_lexicon)
+        if result != gameplay.ACCEPTED:
+            self.message = RESULT_MESSAGES[result]
+        elif self.status() == gameplay.WON:
+            self.message = f"You've guessed the right word! Score: {gameplay.score(self.state)}"
+        elif self.status() == gameplay.LOST:
+            self.message = f"The word was {self.state.answer}. Score: {gameplay.score(self.state)}"
+
+    def row_offsets(self):
+        '''
+        Returns the rows of the grid, the message, the keyboard and the help line below the title,
+        and the height all of them need, with an empty row between each.
+        '''
+        grid_row = 2
+        message_row = grid_row + self.guesses + 1
+        keyboard_row = message_row + 2
+        help_row = keyboard_row + len(KEYBOARD_ROWS) + 1
+        return grid_row, message_row, keyboard_row, help_row, help_row + 1
+
+    def draw(self, screen, tile_attributes, key_attributes):
+        '''Draws the grid, the message and the keyboard centered in the screen.'''
+        screen.erase()
+        height, width = screen.getmaxyx()
+        grid_width = self.length * (TILE_WIDTH + 1) - 1
+        grid_row, message_row, keyboard_row, help_row, needed_height = self.row_offsets()
+        if width < max(grid_width, 2 * len(KEYBOARD_ROWS[0])) + 2 or height < needed_height:
+            screen.addstr(0, 0, "Make the terminal bigger"[:width - 1])
+            return
+
+        state = self.state
+        mode = ", hard mode" if self.hard_mode else ""
+        title = f"{self.length} letters, {self.guesses} guesses{mode} - answers left: {len(state.candidates)}"
+        top = (height - needed_height) // 2
+        screen.addstr(top, max(0, (width - len(title)) // 2), title[:width - 1])
+
+        # Draws each tile with its letter, if there is one, and its color.
+        grid_x = (width - grid_width) // 2
+        for row in range(self.guesses):
+            for column in range(self.length):
+                letter = state.letter_at(row, column) or "_"
+                x = grid_x + column * (TILE_WIDTH + 1)
+                screen.addstr(top + grid_row + row, x, f" {letter} ", tile_attributes[state.tile_color(row, column)])
+
+        screen.addstr(top + message_row, max(0, (width - len(self.message)) // 2), self.message[:width - 1])
+
+        # Colors each key of the keyboard with the best color its letter has gotten in the game.
+        for row, letters in enumerate(KEYBOARD_ROWS):
+            x = (width - 2 * len(letters) + 1) // 2
+            for i, letter in enumerate(letters):
+                screen.addstr(top + keyboard_row + row, x + 2 * i, letter, key_attributes[state.key_color(letter)])
+
+        if self.status() == gameplay.PLAYING:
+            help_text = "Enter: submit   Backspace: delete   Esc: quit"
+        else:
+            help_text = "Enter: new game   Esc: quit"
+        screen.addstr(top + help_row, max(0, (width - len(help_text)) // 2), help_text[:width - 1])
+        screen.move(height - 1, 0)
+
+
+def run(screen, game):
+    curses.curs_set(0)
+    # Lets Esc close the game right away instead of waiting for an escape sequence.
+    curses.set_escdelay(25)
+    tile_attributes, key_attributes = color_attributes()
+    is_running = True
+    while is_running:
+        game.draw(screen, tile_attributes, key_attributes)
+        # Only the cells that changed since the last refresh are written to the terminal.
+        screen.refresh()
+        key = screen.get_wch()
+        if key != curses.KEY_RESIZE:
+            is_running = game.handle_key(key)
+
+
+if __name__ == "__main__":
+    word_lexicon = lexicon.Lexicon()
+    available_lengths = word_lexicon.available_lengths()
+    parser = argparse.ArgumentParser(description="Plays the game in the terminal.")
+    parser.add_argument("--length", type=int, default=5, choices=available_lengths, help="letters of the answer")
+    parser.add_argument("--guesses", type=int, default=gameplay.MAX_GUESSES,
+                        choices=range(gameplay.MIN_GUESSES, gameplay.MAX_GUESSES + 1), metavar="GUESSES",
+                        help=f"guesses of a game, from {gameplay.MIN_GUESSES} to {gameplay.MAX_GUESSES} "
+                             f"(default: {gameplay.MAX_GUESSES})")
+    parser.add_argument("--hard", action="store_true", help="every guess has to use every clue")
+    parser.add_argument("--difficulty", choices=difficulty.BANDS,
+                        help="pick answers from a difficulty band, once difficulty.py has built its index")
+    args = parser.parse_args()
+
+    if args.difficulty and word_lexicon.difficulty_index(args.length) is None:
+        print(f"There is no difficulty index of {args.length} letter words, so answers are picked from every word. "
+              "Run difficulty.py to build it.", file=sys.stderr)
+    curses.wrapper(run, TerminalGame(word_lexicon, args.length, args.guesses, args.hard, args.difficulty))
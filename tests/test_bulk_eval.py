@@ -0,0 +1,22 @@
+import os
+
+import bulk_eval
+import lexicon
+from conftest import ROOT
+
+
+def evaluate(line):
+    word_lexicon = lexicon.Lexicon(os.path.join(ROOT, "word_libraries"))
+    return bulk_eval.evaluate_line(line, word_lexicon, set(word_lexicon.available_lengths()), 7, False)
+
+
+def test_guess_longer_than_answer_is_wrong_length():
+    output, pairs = evaluate("CRANE CRANES CRAN SLATE")
+    assert output.split("\t")[1:4] == ["CRANES=wrong_length", "CRAN=too_short", "SLATE=00202"]
+    assert pairs == 3
+
+
+def test_guesses_of_invalid_answer_are_counted_and_echoed():
+    output, pairs = evaluate("CR4NE CRANE SLATE")
+    assert output.split("\t") == ["CR4NE", "CRANE=invalid_answer", "SLATE=invalid_answer", "invalid_answer"]
+    assert pairs == 2
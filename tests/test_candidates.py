@@ -0,0 +1,41 @@
+import os
+import random
+
+import pytest
+
+import candidates
+import lexicon
+import rules
+from conftest import ROOT
+
+
+@pytest.fixture(scope="module")
+def word_lexicon():
+    return lexicon.Lexicon(os.path.join(ROOT, "word_libraries"))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_apply_keeps_the_answers_that_give_the_same_feedback(word_lexicon, seed):
+    rng = random.Random(seed)
+    pick_words = list(word_lexicon.pick_words(5))
+    check_words = word_lexicon.check_words(5)
+    answer = rng.choice(pick_words)
+    candidate_set = candidates.CandidateSet(word_lexicon.candidate_index(5))
+    possible = pick_words
+    # Guesses with repeated letters are played as well, since their feedback is the easiest to get wrong.
+    for guess in [check_words.random_word(rng) for i in range(3)] + ["EERIE"]:
+        color_codes = rules.score_word(guess, answer)
+        candidate_set.apply(guess, color_codes)
+        possible = [word for word in possible if rules.score_word(guess, word) == color_codes]
+        assert list(candidate_set) == possible
+        assert len(candidate_set) == len(possible)
+    assert answer in possible
+
+
+def test_follows_clues(word_lexicon):
+    candidate_set = candidates.CandidateSet(word_lexicon.candidate_index(5))
+    candidate_set.apply("CRANE", rules.score_word("CRANE", "TRACE"))
+    assert candidate_set.follows_clues("TRACE")
+    # The green R, A and E have to stay on their spots and the yellow C has to be used somewhere.
+    assert not candidate_set.follows_clues("CAROM")
+    assert not candidate_set.follows_clues("GRAVE")
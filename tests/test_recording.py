@@ -0,0 +1,56 @@
+import pygame
+import pytest
+
+# replay sets up the dummy video driver before main is imported.
+import replay
+import main
+import recording
+
+
+@pytest.fixture
+def recorded_session(tmp_path, monkeypatch):
+    path = str(tmp_path / "session.wrl")
+    monkeypatch.setattr(main, "stats_log", None)
+    # replay_session swaps in its own preloader, so the real one is put back after the test.
+    monkeypatch.setattr(main, "game_preloader", main.game_preloader)
+    recorder = recording.SessionRecorder(path, main.num_of_letters, main.guesses, main.hard_mode, main.board_count,
+                                         (main.screen_layout.width, main.screen_layout.height))
+    monkeypatch.setattr(main, "session_recorder", recorder)
+    main.buttons_init()
+    main.main_menu()
+
+    start_position = main.start_button.background.center
+    events = [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=start_position),
+              pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=start_position)]
+    check_words = main.word_lexicon.check_words(main.num_of_letters)
+    for word in (check_words[0], check_words[1]):
+        for letter in word:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=ord(letter.lower()), unicode=letter.lower(), mod=0,
+                                             scancode=0))
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r", mod=0, scancode=0))
+
+    for event in events:
+        main.event = event
+        main.handle_event()
+    recorded_boards = [recording.Board.from_game(board) for board in main.game_boards()]
+    recorder.close(main.game_boards())
+    return path, events, recorded_boards
+
+
+def test_session_log_reads_back(recorded_session):
+    path, events, recorded_boards = recorded_session
+    settings, read_events, answers, boards = recording.read_session(path)
+    assert settings == (main.num_of_letters, main.guesses, main.hard_mode, main.board_count,
+                        [main.screen_layout.width, main.screen_layout.height])
+    assert [(event.type, getattr(event, "key", None)) for event in read_events] == \
+        [(event.type, getattr(event, "key", None)) for event in events]
+    assert answers == [main.game.answer]
+    assert boards == recorded_boards
+    assert main.game.guess_count == 2
+
+
+def test_replay_ends_on_the_recorded_boards(recorded_session):
+    path, events, recorded_boards = recorded_session
+    event_count, mismatches = replay.replay_session(path)
+    assert event_count == len(events)
+    assert mismatches == []
@@ -0,0 +1,50 @@
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+import gameplay
+import lexicon
+from conftest import ROOT
+from server import GameServer, Session
+
+
+@pytest.fixture(scope="module")
+def game_server():
+    return GameServer(lexicon.Lexicon(os.path.join(ROOT, "word_libraries")))
+
+
+def request(game_server, session, message):
+    return asyncio.run(game_server.handle_request(session, json.dumps(message)))
+
+
+@pytest.mark.parametrize("length", [5.0, "5", True, None, [5]])
+def test_new_game_rejects_length_that_is_not_an_int(game_server, length):
+    response = request(game_server, Session(), {"command": "new", "length": length})
+    assert response["ok"] is False
+    assert "word length" in response["error"]
+
+
+def test_new_game_accepts_int_length(game_server):
+    session = Session()
+    response = request(game_server, session, {"command": "new", "length": 5})
+    assert response == {"ok": True, "length": 5, "guesses": gameplay.MAX_GUESSES, "hard_mode": False}
+    assert session.state.length == 5
+
+
+def test_new_game_builds_indexes_off_the_event_loop():
+    word_lexicon = lexicon.Lexicon(os.path.join(ROOT, "word_libraries"))
+    threads = []
+    build_candidate_index = word_lexicon.candidate_index
+
+    def candidate_index(length):
+        threads.append(threading.current_thread())
+        return build_candidate_index(length)
+
+    word_lexicon.candidate_index = candidate_index
+    response = request(GameServer(word_lexicon), Session(), {"command": "new", "length": 5})
+    assert response["ok"] is True
+    assert threads[0] is not threading.main_thread()
+    assert 5 in word_lexicon.candidate_indexes and 5 in word_lexicon.difficulty_indexes
@@ -0,0 +1,16 @@
+import queue
+
+import solver
+
+
+def test_hint_service_keeps_answering_after_a_failed_request(monkeypatch):
+    def load_pattern_table(length):
+        raise MemoryError("no room for the pattern table")
+
+    monkeypatch.setattr(solver, "load_pattern_table", load_pattern_table)
+    results = queue.Queue()
+    hint_service = solver.HintService(lambda generation, ranking: results.put((generation, ranking)))
+
+    for i in range(2):
+        generation = hint_service.request(5, [])
+        assert results.get(timeout=5) == (generation, [])
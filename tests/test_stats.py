@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import stats
+
+# (length, guesses, made guesses, won, score) of the games, in the order they ended.
+GAMES = [
+    (5, 6, 3, True, 1200),
+    (5, 6, 4, True, 1000),
+    (5, 6, 6, False, 100),
+    (6, 7, 2, True, 1800),
+    (5, 6, 4, True, 1000),
+    (5, 6, 5, True, 800),
+]
+
+
+def write_games(path, games):
+    stats_log = stats.StatsLog(str(path))
+    for timestamp, game in enumerate(games):
+        stats_log.record(*game, timestamp=timestamp)
+
+
+def test_records_read_back(tmp_path):
+    path = tmp_path / "player_data" / "game_results.bin"
+    write_games(path, GAMES)
+    results = stats.load_results(str(path))
+    assert len(results) == len(GAMES)
+    assert results["timestamp"].tolist() == list(range(len(GAMES)))
+    assert results["made_guesses"].tolist() == [game[2] for game in GAMES]
+    assert results["score"].tolist() == [game[4] for game in GAMES]
+
+
+def test_partly_written_record_is_left_out(tmp_path):
+    path = tmp_path / "game_results.bin"
+    write_games(path, GAMES[:2])
+    with open(path, "ab") as log_file:
+        log_file.write(b"\1\2\3")
+    assert len(stats.load_results(str(path))) == 2
+
+
+def test_missing_log_has_no_games(tmp_path):
+    summary = stats.summarize(str(tmp_path / "missing.bin"))
+    assert summary.games == 0 and summary.max_streak == 0 and summary.current_streak == 0
+    assert summary.win_rate() == 0
+
+
+def test_log_of_another_format_is_rejected(tmp_path):
+    path = tmp_path / "game_results.bin"
+    path.write_bytes(b"WST9" + bytes(12 + stats.RECORD.size))
+    with pytest.raises(stats.StatsError):
+        stats.load_results(str(path))
+
+
+def test_summary_counts_streaks_and_lengths(tmp_path):
+    path = tmp_path / "game_results.bin"
+    write_games(path, GAMES)
+    summary = stats.summarize(str(path))
+    assert (summary.games, summary.wins) == (6, 5)
+    assert summary.max_streak == 3
+    assert summary.current_streak == 3
+    assert summary.guess_counts[[2, 3, 4, 5]].tolist() == [1, 1, 2, 1]
+    assert summary.lengths[6] == (1, 1, 1800.0)
+    games, wins, mean_score = summary.lengths[5]
+    assert (games, wins) == (5, 4)
+    assert np.isclose(mean_score, 820.0)
+
+    write_games(path, [(5, 6, 6, False, 100)])
+    summary = stats.summarize(str(path))
+    assert summary.max_streak == 3
+    assert summary.current_streak == 0
@@ -0,0 +1,61 @@
+import curses
+import os
+
+import pytest
+
+import lexicon
+import terminal
+from conftest import ROOT
+
+
+class FakeScreen:
+    # Raises curses.error like a real window when text doesn't fit, including writes into the bottom right cell.
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.cells = {}
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def erase(self):
+        self.cells.clear()
+
+    def addstr(self, y, x, text, attribute=0):
+        if not (0 <= y < self.height and 0 <= x and x + len(text) <= self.width) or \
+                (y == self.height - 1 and x + len(text) == self.width):
+            raise curses.error("addwstr() returned ERR")
+        for i, character in enumerate(text):
+            self.cells[y, x + i] = character
+
+    def move(self, y, x):
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error("wmove() returned ERR")
+
+    def text(self):
+        return "\n".join("".join(self.cells.get((y, x), " ") for x in range(self.width)) for y in range(self.height))
+
+
+@pytest.fixture(scope="module")
+def word_lexicon():
+    return lexicon.Lexicon(os.path.join(ROOT, "word_libraries"))
+
+
+ATTRIBUTES = (0, 0, 0, 0)
+
+
+@pytest.mark.parametrize("guesses", [2, 7])
+def test_draws_at_minimum_height(word_lexicon, guesses):
+    game = terminal.TerminalGame(word_lexicon, 5, guesses, False, None)
+    needed_height = game.row_offsets()[-1]
+    screen = FakeScreen(needed_height, 80)
+    game.draw(screen, ATTRIBUTES, ATTRIBUTES)
+    assert "Esc: quit" in screen.text()
+    assert "Make the terminal bigger" not in screen.text()
+
+
+def test_asks_for_bigger_terminal_below_minimum_height(word_lexicon):
+    game = terminal.TerminalGame(word_lexicon, 5, 7, False, None)
+    screen = FakeScreen(game.row_offsets()[-1] - 1, 80)
+    game.draw(screen, ATTRIBUTES, ATTRIBUTES)
+    assert "Make the terminal bigger" in screen.text()
@@ -0,0 +1,44 @@
+import os
+
+import wordpack
+
+
+def write_library(library_path, check_words, pick_words):
+    for kind, words in (("check_words", check_words), ("pick_words", pick_words)):
+        os.makedirs(os.path.join(library_path, kind), exist_ok=True)
+        with open(wordpack.word_list_path(kind, 5, library_path), "w") as word_file:
+            word_file.write("\n".join(words) + "\n")
+
+
+def test_word_pack_round_trip(tmp_path):
+    library_path = str(tmp_path)
+    write_library(library_path, ["slate", "crane", "CRANE", "adieu", "toolong"], ["crane", "slate"])
+    check_words, pick_words = wordpack.load_length(5, library_path)
+
+    assert list(check_words) == ["ADIEU", "CRANE", "SLATE"]
+    assert list(pick_words) == ["CRANE", "SLATE"]
+    assert check_words.index("SLATE") == 2 and check_words[-1] == "SLATE"
+    assert "CRANE" in check_words and "CRANX" not in check_words and "CRAN" not in check_words
+    # The records start right after the 64 byte header.
+    pack_path = wordpack.word_pack_path("check_words", 5, library_path)
+    assert wordpack.HEADER.size == 64
+    assert os.path.getsize(pack_path) == 64 + 3 * 5
+
+
+def test_word_pack_is_rebuilt_when_its_source_changes(tmp_path):
+    library_path = str(tmp_path)
+    write_library(library_path, ["crane", "slate"], ["crane"])
+    wordpack.load_length(5, library_path)
+    source_path = wordpack.word_list_path("check_words", 5, library_path)
+    pack_path = wordpack.word_pack_path("check_words", 5, library_path)
+
+    # Touching the source without changing it keeps the pack.
+    os.utime(source_path, ns=(0, 0))
+    assert not wordpack.is_stale(source_path, pack_path, 5)
+    assert not wordpack.build_length(5, library_path)
+
+    write_library(library_path, ["crane", "slate", "trace"], ["crane"])
+    assert wordpack.is_stale(source_path, pack_path, 5)
+    check_words, pick_words = wordpack.load_length(5, library_path)
+    assert list(check_words) == ["CRANE", "SLATE", "TRACE"]
+    assert not wordpack.is_stale(source_path, pack_path, 5)
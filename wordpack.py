@@ -0,0 +1,239 @@
+'''
+Compiles the .txt word lists into a binary format that is opened with mmap instead of being parsed.
+
+A word pack is a 64 byte header followed by every word of the list, uppercased, deduplicated and sorted,
+stored back to back as fixed width ASCII records. The header records the size, modification time and SHA-256
+checksum of the source file, so a pack whose source has changed is rebuilt before it is used.
+
+Usage:
+    python wordpack.py [--force]
+'''
+import argparse
+import hashlib
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+
+WORD_LIBRARY_PATH = "word_libraries"
+WORD_LIST_KINDS = ("check_words", "pick_words")
+MIN_WORD_LENGTH = 3
+MAX_WORD_LENGTH = 15
+
+MAGIC = b"WPK1"
+# Magic, format version, word length, word count, source size, source modification time and source checksum,
+# padded to 64 bytes.
+HEADER = struct.Struct("<4sHHIqq32s4x")
+VERSION = 2
+
+
+class WordPackError(Exception):
+    pass
+
+
+def word_list_path(kind, length, library_path=WORD_LIBRARY_PATH):
+    '''Returns the path of the .txt source of a word list.'''
+    return os.path.join(library_path, kind, f"{length}_letter_words.txt")
+
+
+def word_pack_path(kind, length, library_path=WORD_LIBRARY_PATH):
+    '''Returns the path of the compiled word pack of a word list.'''
+    return os.path.join(library_path, "compiled", kind, f"{length}_letter_words.wpk")
+
+
+def available_lengths(library_path=WORD_LIBRARY_PATH):
+    '''Returns the sorted word lengths from MIN_WORD_LENGTH to MAX_WORD_LENGTH that have both word lists.'''
+    lengths = []
+    for file_name in os.listdir(os.path.join(library_path, "check_words")):
+        prefix = file_name.split("_")[0]
+        if file_name.endswith("_letter_words.txt") and prefix.isdigit():
+            length = int(prefix)
+            if MIN_WORD_LENGTH <= length <= MAX_WORD_LENGTH and \
+                    os.path.exists(word_list_path("pick_words", length, library_path)):
+                lengths.append(length)
+    return sorted(lengths)
+
+
+def read_words(path, length):
+    '''Reads all words with the right length from a word file and uppers them.'''
+    words = []
+    with open(path, "r") as word_file:
+        for word in word_file:
+            word = word.rstrip().upper()
+            if len(word) == length:
+                words.append(word)
+    return words
+
+
+def file_checksum(path):
+    with open(path, "rb") as source_file:
+        return hashlib.sha256(source_file.read()).digest()
+
+
+def word_lists_checksum(check_words, pick_words):
+    '''Combines the source checksums of both word packs of a length, so files built from them can be checked.'''
+    return hashlib.sha256(check_words.checksum + pick_words.checksum).digest()
+
+
+def clean_words(source_path, length):
+    '''Reads a .txt word list and returns its words uppercased, deduplicated and sorted.'''
+    words = sorted(set(read_words(source_path, length)))
+    for word in words:
+        if not (word.isascii() and word.isalpha()):
+            raise WordPackError(f"{source_path}: {word!r} is not a word of the letters A-Z")
+    return words
+
+
+def write_word_pack(words, source_path, pack_path, length):
+    '''Writes cleaned words to a word pack, with the details of the source file they came from in the header.'''
+    source_stat = os.stat(source_path)
+    header = HEADER.pack(MAGIC, VERSION, length, len(words), source_stat.st_size, source_stat.st_mtime_ns,
+                         file_checksum(source_path))
+
+    # Writes to a temporary file first, so a pack that is open somewhere else is never half written.
+    os.makedirs(os.path.dirname(pack_path), exist_ok=True)
+    temporary_path = f"{pack_path}.tmp"
+    with open(temporary_path, "wb") as pack_file:
+        pack_file.write(header)
+        pack_file.write("".join(words).encode("ascii"))
+    os.replace(temporary_path, pack_path)
+
+
+def read_header(pack_path):
+    '''Returns the unpacked header of a word pack, or None if the file is missing or not a word pack.'''
+    try:
+        with open(pack_path, "rb") as pack_file:
+            data = pack_file.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+
+    if len(data) < HEADER.size:
+        return None
+    header = HEADER.unpack(data)
+    if header[0] != MAGIC or header[1] != VERSION:
+        return None
+    return header
+
+
+def is_stale(source_path, pack_path, length):
+    '''Checks if a word pack is missing or was built from a different version of its source.'''
+    header = read_header(pack_path)
+    if header is None or header[2] != length:
+        return True
+
+    size, mtime_ns, checksum = header[4:7]
+    source_stat = os.stat(source_path)
+    if source_stat.st_size == size and source_stat.st_mtime_ns == mtime_ns:
+        return False
+    # The file was touched, for example by a checkout, so only a changed checksum counts.
+    return file_checksum(source_path) != checksum
+
+
+class WordPack:
+    '''
+    A compiled word list opened with mmap. Words are read straight from the mapped file,
+    and lookups use a binary search over the sorted records.
+    '''
+    def __init__(self, pack_path):
+        self.path = pack_path
+        with open(pack_path, "rb") as pack_file:
+            self.data = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.length, self.count, size, mtime_ns, self.checksum = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise WordPackError(f"{pack_path} is not a version {VERSION} word pack")
+        self.words = memoryview(self.data)[HEADER.size:HEADER.size + self.count * self.length]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("word pack index out of range")
+        return str(self.words[i * self.length:(i + 1) * self.length], "ascii")
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def __contains__(self, word):
+        return self.index(word) >= 0
+
+    def index(self, word):
+        '''Returns the index of a word in the pack, or -1 if it isn't in the pack.'''
+        if len(word) != self.length:
+            return -1
+
+        key = word.encode("ascii", "replace")
+        low = 0
+        high = self.count
+        while low < high:
+            middle = (low + high) // 2
+            start = HEADER.size + middle * self.length
+            record = self.data[start:start + self.length]
+            if record < key:
+                low = middle + 1
+            elif record > key:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def random_word(self, rng=random):
+        return self[rng.randrange(self.count)]
+
+
+def build_length(length, library_path=WORD_LIBRARY_PATH, force=False):
+    '''
+    Compiles the check and pick word lists of a word length if they are stale, and returns True if any was rebuilt.
+    Raises WordPackError if a pick word is missing from the check words, since it could never be guessed.
+    '''
+    stale_kinds = []
+    for kind in WORD_LIST_KINDS:
+        if force or is_stale(word_list_path(kind, length, library_path), word_pack_path(kind, length, library_path),
+                             length):
+            stale_kinds.append(kind)
+    if not stale_kinds:
+        return False
+
+    # Both lists are checked before anything is written, so a failed build leaves the old packs in place.
+    words = {kind: clean_words(word_list_path(kind, length, library_path), length) for kind in WORD_LIST_KINDS}
+    missing = sorted(set(words["pick_words"]) - set(words["check_words"]))
+    if missing:
+        raise WordPackError(f"{len(missing)} pick words of length {length} are not check words: "
+                            f"{', '.join(missing[:10])}")
+
+    for kind in stale_kinds:
+        write_word_pack(words[kind], word_list_path(kind, length, library_path),
+                        word_pack_path(kind, length, library_path), length)
+    return True
+
+
+def load_length(length, library_path=WORD_LIBRARY_PATH):
+    '''Returns the (check words, pick words) packs of a word length, rebuilding them first if they are stale.'''
+    build_length(length, library_path)
+    return (WordPack(word_pack_path("check_words", length, library_path)),
+            WordPack(word_pack_path("pick_words", length, library_path)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compiles the word lists into word packs.")
+    parser.add_argument("--library", default=WORD_LIBRARY_PATH, help="path of the word library")
+    parser.add_argument("--force", action="store_true", help="rebuild every pack, even if it isn't stale")
+    args = parser.parse_args()
+
+    for word_length in available_lengths(args.library):
+        start_time = time.perf_counter()
+        try:
+            was_rebuilt = build_length(word_length, args.library, args.force)
+        except WordPackError as error:
+            print(f"error: {error}", file=sys.stderr)
+            sys.exit(1)
+
+        elapsed = time.perf_counter() - start_time
+        status = "built" if was_rebuilt else "up to date"
+        print(f"{word_length} letters: {status} in {elapsed:.3f}s")